@@ -0,0 +1,272 @@
+"""
+Correctness checks for edge cases the benchmarks don't exercise. Each
+check returns a list of problems; fails (exit code 1) if any check finds
+one.
+
+    python bench/checks.py [-v]
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import io  # noqa: E402
+import json  # noqa: E402
+import glob  # noqa: E402
+import importlib  # noqa: E402
+import random  # noqa: E402
+import threading  # noqa: E402
+import warnings  # noqa: E402
+from fractions import Fraction  # noqa: E402
+from functools import reduce  # noqa: E402
+from math import gcd  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+import aufbau  # noqa: E402
+import balancer  # noqa: E402
+import termo_cli  # noqa: E402
+import termo_instrument  # noqa: E402
+import termo_numeric  # noqa: E402
+import termo_sweep  # noqa: E402
+
+# (Z, charge, abbreviated ground-state configuration, or the electron count
+# of the noble gas it is isoelectronic with)
+IONS = [
+    (26, 2, "[Ar] 3d^6"),
+    (26, 3, "[Ar] 3d^5"),
+    (29, 1, "[Ar] 3d^10"),
+    (46, 2, "[Kr] 4d^8"),
+    (50, 2, "[Kr] 5s^2 4d^10"),
+    (78, 2, "[Xe] 4f^14 5d^8"),
+    (81, 1, "[Xe] 6s^2 4f^14 5d^10"),
+    # Ln3+: 6s and 5d go first, then 4f, never the 5s/5p core
+    (57, 3, 54),
+    (58, 3, "[Xe] 4f^1"),
+    (60, 3, "[Xe] 4f^3"),
+    (63, 3, "[Xe] 4f^6"),
+    (64, 3, "[Xe] 4f^7"),
+    (71, 3, "[Xe] 4f^14"),
+    (58, 4, 54),
+    # An4+
+    (90, 4, 86),
+    (92, 4, "[Rn] 5f^2"),
+    (94, 4, "[Rn] 5f^4"),
+    (8, -2, 10),
+]
+
+
+def check_ions():
+    problems = []
+    for Z, charge, expected in IONS:
+        if isinstance(expected, int):
+            got, expected = aufbau.ground_state_config(Z, charge), aufbau.config_string(expected)
+        else:
+            got = aufbau.ground_state_config(Z, charge, abbreviated=True)
+        if got != expected:
+            problems.append(f"Z={Z} charge {charge:+d}: {got!r}, expected {expected!r}")
+        # ionizing step by step must land on the same configuration
+        if charge > 0:
+            config = aufbau.ground_state(Z)
+            for _ in range(charge):
+                config = config.ionize()
+            if config != aufbau.ground_state(Z, charge):
+                problems.append(f"Z={Z}: ionize() x{charge} gives {aufbau.format_config(config)!r}")
+    return problems
+
+
+# (function, scalar arguments, expected); the array path gets the same
+# arguments as 1-element arrays
+NUMERIC = [
+    (termo_numeric.k_from_delta_g, (-2.879e6, 298.15), np.inf),
+    (termo_numeric.k_from_delta_g, (2.879e6, 298.15), 0.0),
+    (termo_numeric.k_from_delta_g, (0.0, 298.15), 1.0),
+    (termo_numeric.delta_g_from_k, (0.0, 298.15), np.inf),
+    (termo_numeric.delta_g_from_k, (-1.0, 298.15), np.nan),
+    (termo_numeric.delta_g_from_k, (np.inf, 298.15), -np.inf),
+    (termo_numeric.delta_g_from_k, (1.0, 298.15), 0.0),
+    (termo_numeric.k_at_temperature, (1.0, 298.15, 100.0, -3e6), np.inf),
+    (termo_numeric.k_at_temperature, (0.0, 298.15, 100.0, -3e6), np.nan),
+    (termo_numeric.k_at_temperature, (1.0, 298.15, 298.15, 5e4), 1.0),
+    (termo_numeric.crossover_temperature, (100.0, 0.0), np.nan),
+]
+
+
+def check_numeric():
+    problems = []
+    for fn, args, expected in NUMERIC:
+        name = f"{fn.__name__}{args}"
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            try:
+                scalar = fn(*args)
+                array = fn(*(np.array([a]) for a in args))
+            except Exception as e:
+                problems.append(f"{name}: {type(e).__name__}: {e}")
+                continue
+        if not isinstance(scalar, float):
+            problems.append(f"{name}: scalar path returned {type(scalar).__name__}")
+        for path, got in (("scalar", scalar), ("array", array)):
+            if not np.allclose(got, expected, rtol=1e-12, atol=0, equal_nan=True):
+                problems.append(f"{name}: {path} path gives {got}, expected {expected}")
+    return problems
+
+
+def check_cli_json():
+    "JSONL output must be strict JSON even when K overflows."
+    problems = []
+    row = {"id": "r1", "reaction": "A -> B", "dH": -1e4, "dG": None, "dS": 1.5,
+           "K(100)": float("inf"), "K(0)": float("nan"), "error": None}
+    out = io.StringIO()
+    termo_cli.write_rows([row], out, "jsonl")
+
+    def reject(constant):
+        raise ValueError(f"non-standard JSON constant {constant}")
+
+    try:
+        parsed = json.loads(out.getvalue(), parse_constant=reject)
+    except ValueError as e:
+        return [f"write_rows jsonl: {e}: {out.getvalue().strip()}"]
+    expected = dict(row, **{"K(100)": None, "K(0)": None})
+    if parsed != expected:
+        problems.append(f"write_rows jsonl: {parsed}, expected {expected}")
+    return problems
+
+
+def fraction_nullspace(matrix, n_cols):
+    "The original balancer.nullspace (RREF over Fractions), as primitive integer vectors."
+    rows = [[Fraction(v) for v in row] for row in matrix]
+    pivots = []
+    r = 0
+    for c in range(n_cols):
+        pivot = next((i for i in range(r, len(rows)) if rows[i][c] != 0), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        lead = rows[r][c]
+        rows[r] = [v / lead for v in rows[r]]
+        for i in range(len(rows)):
+            if i != r and rows[i][c] != 0:
+                factor = rows[i][c]
+                rows[i] = [a - factor * b for a, b in zip(rows[i], rows[r])]
+        pivots.append(c)
+        r += 1
+        if r == len(rows):
+            break
+
+    basis = []
+    for free in (c for c in range(n_cols) if c not in pivots):
+        vec = [Fraction(0)] * n_cols
+        vec[free] = Fraction(1)
+        for row, p in zip(rows, pivots):
+            vec[p] = -row[free]
+        lcm = reduce(lambda a, b: a * b // gcd(a, b), (v.denominator for v in vec), 1)
+        ints = [int(v * lcm) for v in vec]
+        g = reduce(gcd, ints, 0) or 1
+        basis.append([i // g for i in ints])
+    return basis
+
+
+def check_nullspace(n=20000, seed=0):
+    "Integer-only elimination must give the same basis as the Fraction version."
+    rng = random.Random(seed)
+    problems = []
+    for _ in range(n):
+        n_rows, n_cols = rng.randint(1, 6), rng.randint(2, 7)
+        # composition matrices: mostly small atom counts, some zero rows/columns
+        matrix = [[rng.choice((0, 0, 1, 2, 3, 4, 6, -1, -2)) for _ in range(n_cols)] for _ in range(n_rows)]
+        got, expected = balancer.nullspace(matrix, n_cols), fraction_nullspace(matrix, n_cols)
+        if got != expected:
+            problems.append(f"nullspace({matrix}): {got}, expected {expected}")
+            if len(problems) == 5:
+                break
+    return problems
+
+
+def check_sweep_chunks():
+    "iter_sweep must respect max_bytes even when one row is larger, and give the same result."
+    problems = []
+    rng = np.random.default_rng(0)
+    H, S = rng.normal(-100, 50, 37), rng.normal(0, 100, 37)
+    T = np.linspace(1, 3000, 1001)
+    (reference,) = termo_sweep.iter_sweep(H, S, T)
+    for max_bytes in (24 * 1001 * 5, 24 * 1001, 24 * 500, 24 * 7):
+        G, K = np.full_like(reference.G, np.nan), np.full_like(reference.K, np.nan)
+        for chunk in termo_sweep.iter_sweep(H, S, T, max_bytes):
+            if chunk.G.size * 3 * 8 > max_bytes:
+                problems.append(f"max_bytes {max_bytes}: chunk of {chunk.G.shape} cells")
+            G[chunk.start:chunk.stop, chunk.t_start:chunk.t_stop] = chunk.G
+            K[chunk.start:chunk.stop, chunk.t_start:chunk.t_stop] = chunk.K
+        if not (np.array_equal(G, reference.G) and np.array_equal(K, reference.K)):
+            problems.append(f"max_bytes {max_bytes}: chunked result differs")
+    return problems
+
+
+def check_instrument_coverage():
+    """
+    With profiling on, no module in src/ may still hold an uninstrumented
+    stage function (a `from x import f` copy the swap missed), and none may
+    hold a wrapper after disable().
+    """
+    for path in sorted(glob.glob(os.path.join(ROOT, "src", "termo_*.py"))) + [
+            os.path.join(ROOT, "src", "enumerate_reactions.py")]:
+        importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+
+    def leftovers(functions):
+        ids = {id(fn): stage for stage, fn in functions.items()}
+        return [f"{module.__name__}.{name} ({ids[id(value)]})"
+                for module in termo_instrument._own_modules()
+                for name, value in vars(module).items() if id(value) in ids]
+
+    problems = []
+    termo_instrument.enable()
+    try:
+        problems += [f"not instrumented: {m}" for m in leftovers(termo_instrument._originals)]
+    finally:
+        termo_instrument.disable()
+    problems += [f"not restored: {m}" for m in leftovers(termo_instrument._wrappers)]
+    return problems
+
+
+def check_instrument_reporter():
+    "The summary_every thread must survive stages being added while it reports."
+    errors = []
+    hook, threading.excepthook = threading.excepthook, lambda args: errors.append(args.exc_value)
+    try:
+        prof = termo_instrument.enable(summary_every=0.0005, stream=io.StringIO())
+        try:
+            for i in range(200000):
+                prof.record(f"stage{i}", 0.0, 1e-6, False)
+                prof.count(f"counter{i}", True)
+        finally:
+            termo_instrument.disable()
+    finally:
+        threading.excepthook = hook
+    return [f"reporter thread: {type(e).__name__}: {e}" for e in errors]
+
+
+CHECKS = [check_ions, check_numeric, check_cli_json, check_nullspace, check_sweep_chunks,
+          check_instrument_coverage, check_instrument_reporter]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-v", "--verbose", action="store_true", help="list passing checks too")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for check in CHECKS:
+        problems = check()
+        if problems or args.verbose:
+            print(f"{check.__name__}: {len(problems)} problems")
+        for problem in problems:
+            print("  " + problem)
+        failed += bool(problems)
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
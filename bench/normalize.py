@@ -0,0 +1,229 @@
+"""
+Regression + throughput benchmark for src/ocr_normalize.py.
+
+Checks that `chemistry_post_process` / `text_to_latex` give exactly the
+output of the old ModernScreenOCR methods (copied verbatim below) on a
+hand-written corpus plus randomly generated OCR-like text, then times both
+versions on a large multi-page text. Fails (exit code 1) on any mismatch.
+
+    python bench/normalize.py [--random 20000] [--pages 200] [--seed 0]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import ocr_normalize  # noqa: E402
+
+
+def legacy_chemistry_post_process(text):
+    """Enhanced post-processing for chemistry notation"""
+    import re
+
+    # Phase 1: Fix common OCR mistakes
+    replacements = {
+        # Arrows
+        '—>': '→', '-->': '→', '->': '→', '=>': '→',
+        '—»': '→', '-»': '→', '>>': '→',
+        '<->': '↔', '<=>': '⇌', '<==>': '⇌', '==': '⇌',
+
+        # Mathematical symbols
+        '+-': '±', '+/-': '±',
+        'delta': 'Δ', 'Delta': 'Δ',
+        'alpha': 'α', 'beta': 'β', 'gamma': 'γ',
+
+        # Fix common letter confusion
+        'S04': 'SO₄', 'H20': 'H₂O', 'C02': 'CO₂',
+        'NH3': 'NH₃', 'CH4': 'CH₄', 'H2S04': 'H₂SO₄',
+    }
+
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+
+    # Phase 2: Handle subscripts and superscripts
+
+    # Convert subscript patterns (e.g., H2 -> H₂)
+    subscript_map = str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉')
+
+    # Find chemical formulas and fix subscripts
+    def fix_subscripts(match):
+        formula = match.group(0)
+        # Replace numbers after letters with subscripts
+        result = re.sub(r'([A-Z][a-z]?)(\d+)',
+                        lambda m: m.group(1) + m.group(2).translate(subscript_map),
+                        formula)
+        return result
+
+    # Apply to common patterns
+    text = re.sub(r'\b[A-Z][a-z]?\d*(?:\([a-z]+\))?(?:[A-Z][a-z]?\d*)*\b',
+                  fix_subscripts, text)
+
+    # Handle superscripts for charges
+    superscript_map = str.maketrans('0123456789+-', '⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻')
+
+    # Fix ion charges (e.g., Na+ -> Na⁺, SO4 2- -> SO₄²⁻)
+    text = re.sub(r'(\w+)\s*(\d*)\s*([+-])',
+                  lambda m: m.group(1) + m.group(2).translate(superscript_map) + m.group(3).translate(superscript_map),
+                  text)
+
+    # Fix charges at the beginning (e.g., 2+ -> ²⁺)
+    text = re.sub(r'\b(\d+)([+-])',
+                  lambda m: m.group(1).translate(superscript_map) + m.group(2).translate(superscript_map),
+                  text)
+
+    # Phase 3: Clean up spacing
+    text = re.sub(r'\s*([\+→⇌↔])\s*', r' \1 ', text)
+    text = re.sub(r'\s+', ' ', text)
+
+    return text.strip()
+
+
+def legacy_text_to_latex(text):
+    """Convert text to LaTeX format"""
+    import re
+
+    # Basic LaTeX conversion
+    latex = text
+
+    # Convert arrows
+    latex = latex.replace('→', r'\rightarrow')
+    latex = latex.replace('←', r'\leftarrow')
+    latex = latex.replace('↔', r'\leftrightarrow')
+    latex = latex.replace('⇌', r'\rightleftharpoons')
+
+    # Convert subscripts
+    latex = re.sub(r'([A-Z][a-z]?)([₀-₉]+)',
+                   lambda m: m.group(1) + '_{' + m.group(2).translate(str.maketrans('₀₁₂₃₄₅₆₇₈₉', '0123456789')) + '}',
+                   latex)
+
+    # Convert superscripts
+    latex = re.sub(r'([A-Z][a-z]?\d*)([⁰-⁹⁺⁻]+)',
+                   lambda m: m.group(1) + '^{' + m.group(2).translate(str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻', '0123456789+-')) + '}',
+                   latex)
+
+    # Wrap in math mode if not already
+    if not latex.startswith('$'):
+        latex = '$' + latex + '$'
+
+    return latex
+
+
+CORPUS = [
+    "",
+    "   ",
+    "H2S04 -> 2H+ + S04 2-",
+    "C6H12O6 + 6O2 --> 6C02 + 6H20",
+    "N2 + 3H2 <=> 2NH3",
+    "N2 + 3H2 <==> 2NH3",
+    "CH4 + 2O2 => C02 + 2H20",
+    "Fe3+ + 3OH- -> Fe(OH)3",
+    "Na2SO4(s) -> 2Na+(aq) + SO4 2-(aq)",
+    "Cu(s)+2Ag+(aq)—>Cu2+(aq)+2Ag(s)",
+    "A <-> B",
+    "delta H = -2801.3 kJ/mol +- 0.5",
+    "Delta G = delta H - T delta S",
+    "alpha + beta >> gamma",
+    "2+ 3- +2 -3",
+    "H2O2 ->> H2O + O2",
+    "Fe(s)Cl2+",
+    "betalpha deltalpha alphabeta",
+    "+->  =>> <=>> ==> ===",
+    "Al+++ SO4-- NH4+ PO4 3-",
+    "H+ +-> OH-",
+    "x\t+\n y  →  z ⇌ w ↔ v",
+    "Mg(OH)2 ⇌ Mg2+ + 2OH−",
+    "K = [NH3]^2 / ([N2][H2]^3)",
+    "ΔG° = -RT ln K",
+    "CO32- + 2H+ -> H2O + CO2",
+    "$already latex$",
+    "SO₄²⁻ + H₂O",
+    "Ba2+ + S04 2- -> BaS04(s)",
+    "1s2 2s2 2p6 3s1",
+]
+
+TOKENS = [
+    "H2", "O2", "H2O", "H20", "S04", "H2S04", "C02", "NH3", "CH4", "Na", "Cl", "Fe", "Cu(s)", "(aq)",
+    "Fe(OH)3", "SO4", "2", "3", "12", "+", "-", "->", "-->", "—>", "=>", "<=>", "<->", "<==>", "==",
+    ">>", "—»", "-»", "+-", "+/-", "delta", "Delta", "alpha", "beta", "gamma", "→", "⇌", "↔", "←",
+    " ", "  ", "\t", "\n", "(", ")", "[", "]", "^", "x", "kJ", "mol", "°", "²", "⁺", "₂", "$", ".",
+    ",", "=", "<", ">", "/", "Δ", "ln", "K", "T", "_", "é",
+]
+
+
+def random_text(rng: random.Random, n_tokens: int) -> str:
+    return "".join(rng.choice(TOKENS) for _ in range(n_tokens))
+
+
+def check(texts):
+    mismatches = []
+    for text in texts:
+        expected = legacy_chemistry_post_process(text)
+        got = ocr_normalize.chemistry_post_process(text)
+        if got != expected:
+            mismatches.append(("chemistry_post_process", text, expected, got))
+            continue
+        for source in (text, expected):
+            expected_latex = legacy_text_to_latex(source)
+            got_latex = ocr_normalize.text_to_latex(source)
+            if got_latex != expected_latex:
+                mismatches.append(("text_to_latex", source, expected_latex, got_latex))
+    return mismatches
+
+
+def throughput(fn, text, repeat=3):
+    best = min(_timed(fn, text) for _ in range(repeat))
+    return len(text.encode("utf-8")) / best / 2**20, best
+
+
+def _timed(fn, text):
+    t0 = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--random", type=int, default=20000, help="random texts in the regression corpus")
+    parser.add_argument("--pages", type=int, default=200, help="pages of text for the throughput run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    texts = CORPUS + [random_text(rng, rng.randint(1, 40)) for _ in range(args.random)]
+    mismatches = check(texts)
+    print(f"regression corpus: {len(texts)} texts, {len(mismatches)} mismatches")
+    for name, text, expected, got in mismatches[:10]:
+        print(f"  {name}({text!r}):\n    expected {expected!r}\n    got      {got!r}")
+
+    # Multi-page capture: mostly plain reaction lines, ~3 KB per page
+    lines = [c for c in CORPUS if c.strip() and not re.search(r"[<]", c)]
+    page = "\n".join(rng.choice(lines) for _ in range(60))
+    big = "\n\n".join(page for _ in range(args.pages))
+    processed = ocr_normalize.chemistry_post_process(big)
+    for label, old, new, text in (
+            ("chemistry_post_process", legacy_chemistry_post_process, ocr_normalize.chemistry_post_process, big),
+            ("text_to_latex", legacy_text_to_latex, ocr_normalize.text_to_latex, processed)):
+        old_mbs, old_t = throughput(old, text)
+        new_mbs, new_t = throughput(new, text)
+        print(f"{label:24s} old {old_mbs:7.2f} MB/s  new {new_mbs:7.2f} MB/s  ({old_t / new_t:.2f}x)")
+
+    # Many small captures: per-call overhead (the old code rebuilt tables every call)
+    small = CORPUS[2:12]
+    for label, old, new in (("chemistry_post_process", legacy_chemistry_post_process,
+                             ocr_normalize.chemistry_post_process),
+                            ("text_to_latex", legacy_text_to_latex, ocr_normalize.text_to_latex)):
+        t_old = min(_timed(lambda _: [old(s) for s in small * 1000], None) for _ in range(3))
+        t_new = min(_timed(lambda _: [new(s) for s in small * 1000], None) for _ in range(3))
+        print(f"{label:24s} old {t_old / len(small) / 1e3 * 1e6:7.2f} µs/call  "
+              f"new {t_new / len(small) / 1e3 * 1e6:7.2f} µs/call  ({t_old / t_new:.2f}x)")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
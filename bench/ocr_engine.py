@@ -0,0 +1,112 @@
+"""
+Cold vs warm OCR latency for the backends in src/ocr_engine.py.
+
+Renders a few chemistry lines with Pillow and recognizes them with every
+backend that is installed: pytesseract (a tesseract process per call, the
+old behaviour), tesserocr and libtesseract in process, and a worker pool.
+For the warm engines the one-off model load is reported separately from
+the per-capture latency.
+
+    python bench/ocr_engine.py [--repeat 20] [--pool-size 2] [--tesseract-cmd PATH]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+import ocr_engine  # noqa: E402
+
+LINES = ["H2SO4 -> 2H+ + SO4 2-", "C6H12O6 + 6O2 -> 6CO2 + 6H2O", "N2 + 3H2 <=> 2NH3"]
+
+
+def sample_image() -> Image.Image:
+    try:
+        font = ImageFont.load_default(size=36)
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+    image = Image.new("L", (900, 60 * len(LINES) + 40), 255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(LINES):
+        draw.text((20, 20 + 60 * i), line, fill=0, font=font)
+    return image
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1e3:8.1f} ms"
+
+
+def bench_engine(label: str, make, image: Image.Image, repeat: int):
+    t0 = time.perf_counter()
+    try:
+        engine = make()
+        if isinstance(engine, ocr_engine.WorkerPoolEngine):
+            engine.warm_up()
+    except Exception as e:
+        print(f"{label:22s} unavailable ({type(e).__name__}: {e})")
+        return None
+    load = time.perf_counter() - t0
+
+    with engine:
+        t0 = time.perf_counter()
+        text = engine.recognize(image, ocr_engine.PSM_SINGLE_BLOCK)
+        first = time.perf_counter() - t0
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            engine.recognize(image, ocr_engine.PSM_SINGLE_BLOCK)
+            times.append(time.perf_counter() - t0)
+        parallel = None
+        if isinstance(engine, ocr_engine.WorkerPoolEngine):
+            t0 = time.perf_counter()
+            threads = [threading.Thread(target=engine.recognize, args=(image, ocr_engine.PSM_SINGLE_BLOCK))
+                       for _ in range(repeat)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            parallel = (time.perf_counter() - t0) / repeat
+
+    print(f"{label:22s} load {_ms(load)}  first {_ms(first)}  median {_ms(statistics.median(times))}"
+          f"  min {_ms(min(times))}" + (f"  parallel {_ms(parallel)}/capture" if parallel else ""))
+    print(f"{'':22s} -> {' | '.join(l for l in text.splitlines() if l.strip())!r}")
+    return statistics.median(times)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--lang", default="eng")
+    parser.add_argument("--tesseract-cmd", help="tesseract executable (also used to find the DLL on Windows)")
+    args = parser.parse_args(argv)
+
+    image = sample_image()
+    cmd = args.tesseract_cmd
+    results = {}
+    for label, make in (
+            ("pytesseract (cold)", lambda: ocr_engine.PytesseractEngine(args.lang, cmd)),
+            ("tesserocr", lambda: ocr_engine.TesserocrEngine(args.lang)),
+            ("libtesseract", lambda: ocr_engine.LibTesseractEngine(args.lang, tesseract_cmd=cmd)),
+            (f"pool[{args.pool_size}]", lambda: ocr_engine.WorkerPoolEngine(args.pool_size, "auto", args.lang,
+                                                                          tesseract_cmd=cmd))):
+        results[label] = bench_engine(label, make, image, args.repeat)
+
+    cold = results.get("pytesseract (cold)")
+    warm = {k: v for k, v in results.items() if v is not None and k != "pytesseract (cold)"}
+    if cold and warm:
+        best = min(warm, key=warm.get)
+        print(f"warm {best} is {cold / warm[best]:.1f}x faster per capture than a tesseract process per call")
+    elif not any(results.values()):
+        print("No Tesseract backend available (install tesseract plus pytesseract or tesserocr)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Selection overlay cost: the old rendering (full-screen RGBA layer as a
+second PhotoImage, selection items deleted and recreated per motion event)
+against src/ocr_overlay.py (frame darkened once, items moved with coords).
+
+Frame preparation is timed with Pillow alone. With a display, PhotoImage
+creation and a synthetic drag on a real canvas are timed too.
+
+    python bench/overlay.py [--size 3840 2160] [--moves 300]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from ocr_overlay import FrameStats, darken  # noqa: E402
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1e3:8.1f} ms"
+
+
+def best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def bench_prepare(image: Image.Image, repeat: int):
+    old = best(lambda: (image.tobytes(), Image.new('RGBA', image.size, (0, 0, 0, 100)).tobytes()), repeat)
+    new = best(lambda: darken(image).tobytes(), repeat)
+    print(f"frame prep (Pillow)   old {_ms(old)}  new {_ms(new)}  ({old / new:.1f}x)")
+
+
+def bench_tk(image: Image.Image, moves: int, repeat: int):
+    import tkinter as tk
+    from PIL import ImageTk
+
+    root = tk.Tk()
+    try:
+        canvas = tk.Canvas(root, width=image.width, height=image.height, highlightthickness=0)
+        canvas.pack()
+        root.update()
+
+        def old_setup():
+            a = ImageTk.PhotoImage(image)
+            b = ImageTk.PhotoImage(Image.new('RGBA', image.size, (0, 0, 0, 100)))
+            return a, b
+
+        old = best(old_setup, repeat)
+        new = best(lambda: ImageTk.PhotoImage(darken(image)), repeat)
+        print(f"overlay setup (Tk)    old {_ms(old)}  new {_ms(new)}  ({old / new:.1f}x)")
+
+        # Old layering, for the repaint cost of the drag
+        layers = old_setup()
+        canvas.create_image(0, 0, anchor=tk.NW, image=layers[0])
+        canvas.create_image(0, 0, anchor=tk.NW, image=layers[1])
+
+        path = [(100 + i * (image.width - 200) // moves, 100 + i * (image.height - 200) // moves)
+                for i in range(moves)]
+        text_style = dict(fill="white", font=("Segoe UI", 10, "bold"), anchor="center")
+        rect_style = dict(outline="#0e7490", width=2, fill="#0e7490", stipple="gray50")
+
+        old_stats = FrameStats()
+        items = []
+        for x, y in path:
+            t0 = time.perf_counter()
+            for item in items:
+                canvas.delete(item)
+            items = [canvas.create_rectangle(50, 50, x, y, **rect_style),
+                     canvas.create_text(x // 2, 40, text=f"{x} × {y}", **text_style)]
+            root.update_idletasks()
+            old_stats.record(time.perf_counter() - t0)
+        for item in items:
+            canvas.delete(item)
+
+        new_stats = FrameStats()
+        rect = canvas.create_rectangle(0, 0, 0, 0, **rect_style)
+        text = canvas.create_text(0, 0, **text_style)
+        for x, y in path:
+            t0 = time.perf_counter()
+            canvas.coords(rect, 50, 50, x, y)
+            canvas.coords(text, x // 2, 40)
+            canvas.itemconfigure(text, text=f"{x} × {y}")
+            root.update_idletasks()
+            new_stats.record(time.perf_counter() - t0)
+
+        for label, stats in (("old drag", old_stats), ("new drag", new_stats)):
+            s = stats.summary()
+            print(f"{label:21s} median {_ms(statistics.median(stats.times))}  p95 {_ms(s['p95_ms'] / 1e3)}"
+                  f"  max {_ms(s['max_ms'] / 1e3)}  over 16 ms: {s['over_budget']}/{s['frames']}")
+    finally:
+        root.destroy()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, nargs=2, default=(3840, 2160), metavar=("W", "H"))
+    parser.add_argument("--moves", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    image = Image.fromarray(rng.integers(0, 256, (args.size[1], args.size[0], 3), dtype=np.uint8))
+    bench_prepare(image, args.repeat)
+    try:
+        bench_tk(image, args.moves, args.repeat)
+    except Exception as e:  # tkinter.TclError without a display
+        print(f"Tk timings skipped ({type(e).__name__}: {e})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
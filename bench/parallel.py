@@ -0,0 +1,58 @@
+"""
+Throughput of the process-pool reaction evaluator (termo_parallel.py) at
+1, 2, 4 and N workers, N = os.cpu_count().
+
+    python bench/parallel.py [--reactions 200000] [--chunk-size 4096]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from termo_cache import load_table  # noqa: E402
+from termo_parallel import calculate_reactions_parallel  # noqa: E402
+
+
+def random_reactions(substances, n, seed=0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        reactants = {s: rng.randint(1, 6) for s in rng.sample(substances, rng.randint(1, 3))}
+        products = {s: rng.randint(1, 6) for s in rng.sample(substances, rng.randint(1, 3))}
+        yield reactants, products
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reactions", type=int, default=200_000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    table = load_table(os.path.join(ROOT, "data", "Appendix2.csv"))
+    reactions = list(random_reactions(list(table.substances), args.reactions))
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cpus})
+
+    print(f"{args.reactions} reactions, chunk size {args.chunk_size}, {cpus} CPUs")
+    base = None
+    reference = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        result = calculate_reactions_parallel(table, reactions, workers, args.chunk_size)
+        elapsed = time.perf_counter() - t0
+        rate = args.reactions / elapsed
+        base = base or rate
+        if reference is None:
+            reference = result.values
+        else:
+            import numpy as np
+            assert np.array_equal(result.values, reference, equal_nan=True), "order/result mismatch"
+        print(f"  {workers:3d} workers: {rate:12,.0f} reactions/s  (x{rate / base:.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Latency and accuracy of the OCR preprocessing presets in
+src/ocr_preprocess.py ("legacy" is the old fixed 3x / threshold 127).
+
+Synthetic captures with known text are rendered with Pillow: screen-sized
+text, coloured slides, dark mode, a lighting gradient, skew, noise and a
+full 4K screen. Per preset and capture it reports
+
+- latency (best of --repeat) and the size of the image sent to Tesseract;
+- ink F1: agreement of the binarized output, scaled back to the capture,
+  with the rendered glyph mask (needs no OCR engine; "-" when deskew
+  changed the geometry);
+- character accuracy of the OCR text, 1 - edit distance / length, when a
+  Tesseract backend (see src/ocr_engine.py) is installed.
+
+    python bench/preprocess.py [--repeat 3] [--no-ocr] [--presets legacy default]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+import ocr_engine  # noqa: E402
+import ocr_preprocess  # noqa: E402
+
+LINES = ["H2SO4 -> 2H+ + SO4 2-", "C6H12O6 + 6O2 -> 6CO2 + 6H2O", "Fe2O3 + 3CO -> 2Fe + 3CO2"]
+
+
+def _font(size: int):
+    for name in ("DejaVuSans.ttf", "arial.ttf", "Arial.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def render(lines, size: int, bg=(245, 245, 245), fg=(20, 20, 20), canvas=None):
+    "Capture and glyph mask with `lines` at font `size`."
+    font = _font(size)
+    width = canvas[0] if canvas else int(size * 0.75 * max(map(len, lines))) + 2 * size
+    height = canvas[1] if canvas else int(size * 1.6 * len(lines)) + size
+    image = Image.new("RGB", (width, height), bg)
+    mask = Image.new("L", (width, height), 0)
+    for target, fill in ((ImageDraw.Draw(image), fg), (ImageDraw.Draw(mask), 255)):
+        for i, line in enumerate(lines):
+            target.text((size, size // 2 + int(i * size * 1.6)), line, fill=fill, font=font)
+    return image, np.asarray(mask) > 127
+
+
+def gradient(image: Image.Image) -> Image.Image:
+    a = np.asarray(image).astype(np.float32)
+    a *= np.linspace(0.35, 1.0, a.shape[1], dtype=np.float32)[None, :, None]
+    return Image.fromarray(a.astype(np.uint8))
+
+
+def noisy(image: Image.Image, sigma: float = 25.0) -> Image.Image:
+    a = np.asarray(image).astype(np.float32)
+    a += np.random.default_rng(0).normal(0.0, sigma, a.shape).astype(np.float32)
+    return Image.fromarray(np.clip(a, 0, 255).astype(np.uint8))
+
+
+def cases():
+    "(name, capture, glyph mask or None, expected text)"
+    text = "\n".join(LINES)
+    image, mask = render(LINES, 13)
+    yield "screen 13px", image, mask, text
+    image, mask = render(LINES, 40)
+    yield "large 40px", image, mask, text
+    image, mask = render(LINES, 18, bg=(30, 60, 200), fg=(230, 40, 40))
+    yield "red on blue", image, mask, text
+    image, mask = render(LINES, 16, bg=(30, 30, 36), fg=(220, 220, 220))
+    yield "dark mode", image, mask, text
+    image, mask = render(LINES, 18)
+    yield "gradient", gradient(image), mask, text
+    yield "noise", noisy(image), mask, text
+    yield "skew 3deg", image.rotate(3, Image.Resampling.BICUBIC, expand=True, fillcolor=(245, 245, 245)), None, text
+    image, mask = render(LINES * 20, 16, canvas=(3840, 2160))
+    yield "4K screen", image, mask, "\n".join(LINES * 20)
+
+
+def ink_f1(output: Image.Image, mask: np.ndarray) -> float:
+    out = np.asarray(output.resize(mask.shape[::-1], Image.Resampling.BOX)) < 128
+    return 2 * (out & mask).sum() / max(1, out.sum() + mask.sum())
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def char_accuracy(text: str, expected: str) -> float:
+    text, expected = " ".join(text.split()), " ".join(expected.split())
+    return max(0.0, 1 - edit_distance(text, expected) / max(1, len(expected)))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--presets", nargs="+", default=list(ocr_preprocess.PRESETS))
+    parser.add_argument("--no-ocr", action="store_true", help="skip OCR even if Tesseract is installed")
+    parser.add_argument("--tesseract-cmd")
+    args = parser.parse_args(argv)
+
+    engine = None
+    if not args.no_ocr:
+        try:
+            engine = ocr_engine.create_engine("auto", tesseract_cmd=args.tesseract_cmd)
+        except Exception as e:
+            print(f"No OCR engine ({type(e).__name__}: {e}), reporting ink F1 only")
+
+    totals = {p: [0.0, 0.0, 0] for p in args.presets}  # latency, accuracy, cases
+    try:
+        print(f"{'capture':12s} {'preset':10s} {'latency':>10s} {'output':>11s} {'ink F1':>7s}"
+              + (f" {'OCR acc':>8s} {'OCR time':>10s}" if engine else ""))
+        for name, image, mask, expected in cases():
+            for preset in args.presets:
+                pipeline = ocr_preprocess.get_pipeline(preset)
+                times = []
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    output = pipeline(image)
+                    times.append(time.perf_counter() - t0)
+                f1 = "-"
+                if mask is not None and abs(output.width / output.height - image.width / image.height) < 0.01:
+                    f1 = f"{ink_f1(output, mask):.3f}"
+                row = (f"{name:12s} {preset:10s} {min(times) * 1e3:8.1f}ms {output.width:>5d}x{output.height:<5d}"
+                       f" {f1:>7s}")
+                totals[preset][0] += min(times)
+                if engine:
+                    t0 = time.perf_counter()
+                    text = engine.recognize(output, ocr_engine.PSM_SINGLE_BLOCK)
+                    ocr_time = time.perf_counter() - t0
+                    accuracy = char_accuracy(text, expected)
+                    totals[preset][1] += accuracy
+                    row += f" {accuracy:8.3f} {ocr_time * 1e3:8.1f}ms"
+                totals[preset][2] += 1
+                print(row)
+    finally:
+        if engine:
+            engine.close()
+
+    print()
+    for preset, (latency, accuracy, n) in totals.items():
+        print(f"{preset:10s} total preprocessing {latency * 1e3:8.1f} ms"
+              + (f", mean OCR accuracy {accuracy / n:.3f}" if engine and n else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
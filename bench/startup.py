@@ -0,0 +1,66 @@
+"""
+Startup benchmark for 4-termo.py: import-to-first-ΔH time in a fresh
+interpreter. Fails (exit code 1) if the median is over the budget or if the
+import pulled in pandas/NumPy/SymPy.
+
+    python bench/startup.py [--budget 0.2] [--repeat 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import time
+t0 = time.perf_counter()
+import importlib.util, sys
+sys.path.insert(0, "src")
+spec = importlib.util.spec_from_file_location("termo", "src/4-termo.py")
+termo = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(termo)
+dH = termo.calculate_reaction(termo.load_table("data/Appendix2.csv"),
+                              {"Na2SO4(s)": 1}, {"Na+(aq)": 2, "SO4--(aq)": 1}, "H")
+elapsed = time.perf_counter() - t0
+heavy = sorted(m for m in ("pandas", "numpy", "sympy", "chempy") if m in sys.modules)
+print(__import__("json").dumps({"elapsed": elapsed, "result": dH, "heavy": heavy}))
+"""
+
+
+def measure(repeat: int):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout))
+    return runs
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=float, default=0.2, help="seconds, import to first result (median)")
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    runs = measure(args.repeat)
+    median = statistics.median(r["elapsed"] for r in runs)
+    heavy = runs[0]["heavy"]
+    print(f"import -> first ΔH: median {median * 1000:.1f} ms over {args.repeat} runs "
+          f"(min {min(r['elapsed'] for r in runs) * 1000:.1f} ms), budget {args.budget * 1000:.0f} ms")
+    print(f"result: {runs[0]['result']}, heavy modules imported: {heavy or 'none'}")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: fast path imported {', '.join(heavy)}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: startup {median:.3f}s over budget {args.budget:.3f}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Benchmark suite for the thermochemistry and atomic-structure code.
+
+Measures cold import, single lookup latency, batch reaction throughput,
+temperature-sweep throughput, molar masses and configuration generation,
+writes the results as JSON with machine metadata and optionally compares
+them against a stored baseline. Runs offline, only needs NumPy.
+
+    python bench/suite.py -o results.json
+    python bench/suite.py --baseline bench/baseline.json --threshold 0.25
+    python bench/suite.py --sizes 1e3 1e4 1e5 1e6 1e7 --save-baseline bench/baseline.json
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+
+import aufbau  # noqa: E402
+import molarmass  # noqa: E402
+from termo_batch import StoichiometryMatrix, calculate_reactions_batch, property_matrix  # noqa: E402
+from termo_cache import load_table  # noqa: E402
+from termo_reaction import Reaction  # noqa: E402
+from termo_sweep import iter_sweep  # noqa: E402
+
+CSV = os.path.join(ROOT, "data", "Appendix2.csv")
+
+COLD_IMPORT = r"""
+import time, sys, importlib.util
+t0 = time.perf_counter()
+sys.path.insert(0, "src")
+spec = importlib.util.spec_from_file_location("mod", {path!r})
+mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(mod)
+print(time.perf_counter() - t0)
+"""
+
+
+def _metric(value, unit, better):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def _best(fn, number, repeat=5):
+    "Best per-call time in seconds."
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def _load_termo():
+    spec = importlib.util.spec_from_file_location("termo", os.path.join(ROOT, "src", "4-termo.py"))
+    termo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(termo)
+    return termo
+
+
+def bench_cold_import(repeat):
+    results = {}
+    for name, path in (("termo", "src/4-termo.py"), ("atom", "src/5-atomOpbygning.py")):
+        times = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", COLD_IMPORT.format(path=path)],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+            times.append(float(out.stdout))
+        results[f"cold_import.{name}"] = _metric(statistics.median(times), "s", "lower")
+    return results
+
+
+def bench_lookup(table):
+    termo = _load_termo()
+    reactants, products = {"SO2(g)": 2, "O2(g)": 1}, {"SO3(g)": 2}
+    compiled = Reaction.compile(table, reactants, products)
+
+    def evaluate_uncached():
+        # evaluate() memoizes; drop the memo so the pass over the value
+        # block is timed, not dict hits
+        compiled._results.clear()
+        return compiled.evaluate_all()
+
+    return {
+        "lookup.lookup_property": _metric(
+            _best(lambda: termo.lookup_property(table, "SO3(g)", "G"), 20000), "s", "lower"),
+        "lookup.calculate_reaction": _metric(
+            _best(lambda: termo.calculate_reaction(table, reactants, products, "G"), 20000), "s", "lower"),
+        "lookup.compiled_reaction": _metric(_best(evaluate_uncached, 20000), "s", "lower"),
+        "lookup.compiled_reaction_memo": _metric(
+            _best(lambda: compiled.evaluate_all(), 20000), "s", "lower"),
+    }
+
+
+def _random_matrix(n_reactions, n_substances, terms=4, seed=0):
+    rng = np.random.default_rng(seed)
+    indptr = np.arange(0, terms * n_reactions + 1, terms, dtype=np.int64)
+    indices = rng.integers(0, n_substances, terms * n_reactions)
+    data = rng.integers(1, 7, terms * n_reactions).astype(np.float64)
+    data[::2] *= -1.0
+    return StoichiometryMatrix(indptr, indices, data, (n_reactions, n_substances))
+
+
+def _random_reactions(substances, n, seed=0):
+    rng = random.Random(seed)
+    return [({s: rng.randint(1, 6) for s in rng.sample(substances, 2)},
+             {s: rng.randint(1, 6) for s in rng.sample(substances, 2)}) for _ in range(n)]
+
+
+def bench_batch(table, sizes, max_compile):
+    results = {}
+    P = property_matrix(table)
+    for size in sizes:
+        matrix = _random_matrix(size, len(table))
+        t = _best(lambda: np.round(matrix @ P, 3), 1)
+        results[f"batch.evaluate.{size:.0e}"] = _metric(size / t, "reactions/s", "higher")
+        if size <= max_compile:
+            reactions = _random_reactions(list(table.substances), size)
+            t = _best(lambda: calculate_reactions_batch(table, reactions), 1, repeat=3)
+            results[f"batch.end_to_end.{size:.0e}"] = _metric(size / t, "reactions/s", "higher")
+    return results
+
+
+def bench_sweep(table, n_reactions=10_000, n_temperatures=1000):
+    rng = np.random.default_rng(1)
+    H = rng.normal(0, 500, n_reactions)
+    S = rng.normal(0, 200, n_reactions)
+    T = np.linspace(200, 2000, n_temperatures)
+
+    def run():
+        for _ in iter_sweep(H, S, T):
+            pass
+
+    t = _best(run, 1, repeat=3)
+    return {"sweep.cells": _metric(n_reactions * n_temperatures / t, "cells/s", "higher")}
+
+
+def bench_molarmass(table):
+    formulas = list(table.substances)
+
+    def cold():
+        molarmass.parse_formula.cache_clear()
+        molarmass.molar_mass.cache_clear()
+        for f in formulas:
+            molarmass.molar_mass(f)
+
+    return {
+        "molarmass.cold_parse": _metric(_best(cold, 5) / len(formulas), "s", "lower"),
+        "molarmass.cached": _metric(_best(lambda: molarmass.molar_mass("C6H12O6"), 50000), "s", "lower"),
+        "molarmass.bulk": _metric(len(formulas) / _best(lambda: molarmass.molar_masses(formulas), 50),
+                                  "formulas/s", "higher"),
+    }
+
+
+def bench_configurations():
+    ns = np.random.default_rng(2).integers(0, aufbau.MAX_N + 1, 1_000_000)
+
+    def grid():
+        aufbau._grid = None
+        aufbau._build_grid()
+
+    return {
+        "config.electron_config": _metric(_best(lambda: aufbau.config_string(79), 100000), "s", "lower"),
+        "config.ground_state": _metric(_best(lambda: aufbau.ground_state(26, 2), 100000), "s", "lower"),
+        "config.vectorized": _metric(ns.size / _best(lambda: aufbau.electron_configs(ns), 1, repeat=7), "configs/s", "higher"),
+        "config.grid_build": _metric(_best(grid, 1, repeat=7), "s", "lower"),
+        "config.render": _metric(_best(lambda: aufbau.ground_state(79).superscript(), 20000), "s", "lower"),
+    }
+
+
+def machine():
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Metrics that got worse than the baseline by more than `threshold` (relative)."""
+    regressions = []
+    for name, new in results["metrics"].items():
+        old = baseline["metrics"].get(name)
+        if old is None or not old["value"]:
+            continue
+        if new["better"] == "lower":
+            change = new["value"] / old["value"] - 1.0
+        else:
+            change = old["value"] / new["value"] - 1.0
+        if change > threshold:
+            regressions.append((name, old["value"], new["value"], change))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression (default 0.25)")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e3, 1e4, 1e5, 1e6],
+                        help="batch sizes in reactions (up to 1e7)")
+    parser.add_argument("--max-compile", type=float, default=1e5,
+                        help="largest size also timed end-to-end from Python dicts")
+    parser.add_argument("--repeat", type=int, default=5, help="cold import repetitions")
+    args = parser.parse_args(argv)
+
+    table = load_table(CSV)
+    metrics = {}
+    metrics.update(bench_cold_import(args.repeat))
+    metrics.update(bench_lookup(table))
+    metrics.update(bench_batch(table, [int(s) for s in args.sizes], int(args.max_compile)))
+    metrics.update(bench_sweep(table))
+    metrics.update(bench_molarmass(table))
+    metrics.update(bench_configurations())
+    results = {"machine": machine(), "metrics": metrics}
+
+    for name, m in metrics.items():
+        print(f"{name:32s} {m['value']:14.6g} {m['unit']}")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"REGRESSION {name}: {old:.6g} -> {new:.6g} ({change:+.0%} worse)")
+        if regressions:
+            return 1
+        print(f"No regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Consistency check for src/termo_uncertainty.py: linear and Monte Carlo
+propagation must agree on the same input, including which entries are NaN
+(reactions with unknown substances, and properties that are '?' in
+Appendix 2), and the spreads must match within sampling error. Also
+times both methods. Fails (exit code 1) on any disagreement.
+
+    python bench/uncertainty.py [--samples 20000] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+
+from termo_cache import load_table  # noqa: E402
+from termo_uncertainty import Uncertainties, propagate_uncertainty  # noqa: E402
+
+REACTIONS = [
+    ({"SO2(g)": 2, "O2(g)": 1}, {"SO3(g)": 2}),
+    # H2O2(l) has no S° ('?'): ΔS° must be NaN, ΔH° and ΔG° known
+    ({"H2O2(l)": 2}, {"H2O(l)": 2, "O2(g)": 1}),
+    # KOH(s) has neither ΔG° nor S°
+    ({"K(s)": 2, "H2O(l)": 2}, {"KOH(s)": 2, "H2(g)": 1}),
+    ({"Unobtainium(s)": 1}, {"O2(g)": 1}),
+]
+
+
+def check(table, uncertainties, samples, seed):
+    problems = []
+    linear = propagate_uncertainty(table, uncertainties, REACTIONS)
+    mc = propagate_uncertainty(table, uncertainties, REACTIONS, method="monte-carlo", samples=samples, seed=seed)
+    for name, a, b in (("mean", linear.mean, mc.mean), ("std", linear.std, mc.std),
+                       ("percentiles", linear.percentiles, mc.percentiles)):
+        if not np.array_equal(np.isnan(a), np.isnan(b)):
+            problems.append(f"{name}: NaN pattern differs\n  linear {np.isnan(a).astype(int).tolist()}"
+                            f"\n  monte-carlo {np.isnan(b).astype(int).tolist()}")
+    for name, a, b in (("mean", linear.mean, mc.mean), ("std", linear.std, mc.std)):
+        both = ~(np.isnan(a) | np.isnan(b))
+        # a few standard errors of the Monte Carlo estimate, plus rounding
+        tolerance = 5 * linear.std[both] / np.sqrt(samples) + 2e-3
+        if np.any(np.abs(a[both] - b[both]) > tolerance):
+            problems.append(f"{name}: linear {a[both]} vs monte-carlo {b[both]}")
+    if not np.isnan(linear.mean[1, 2]) or np.isnan(linear.mean[1, :2]).any():
+        problems.append(f"'?' row: expected only ΔS° NaN, got {linear.mean[1]}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    table = load_table(os.path.join(ROOT, "data", "Appendix2.csv"))
+    uncertainties = Uncertainties(table, np.full((len(table), 3), 0.5))
+
+    problems = check(table, uncertainties, args.samples, args.seed)
+    print(f"linear vs monte-carlo: {len(REACTIONS)} reactions, {len(problems)} problems")
+    for problem in problems:
+        print("  " + problem)
+
+    rng = np.random.default_rng(args.seed)
+    substances = list(table.substances)
+    batch = [({substances[i]: 1 for i in rng.choice(len(substances), 2, replace=False)},
+              {substances[i]: 2 for i in rng.choice(len(substances), 2, replace=False)}) for _ in range(2000)]
+    for method, kwargs in (("linear", {}), ("monte-carlo", {"samples": 2000, "seed": args.seed})):
+        t0 = time.perf_counter()
+        propagate_uncertainty(table, uncertainties, batch, method=method, **kwargs)
+        print(f"{method:12s} {len(batch)} reactions in {(time.perf_counter() - t0) * 1e3:8.1f} ms")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,49 @@
-import pandas as pd
-import numpy as np
-from typing import Dict, Union
+# Only the standard library up here so a single lookup starts fast.
+# pandas is only needed if you pass a DataFrame yourself, NumPy only for
+# the batch/sweep functions (pulled in lazily by __getattr__ below).
+from typing import TYPE_CHECKING, Dict, Union
 
-def lookup_property(df: pd.DataFrame, substance: str, property_name: str) -> float:
+from molarmass import molar_mass
+from termo_cache import load_table
+from termo_instrument import instrumented
+from termo_numeric import crossover_temperature, delta_g_from_k, k_from_delta_g
+from termo_table import ThermoTable, round3
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_LAZY = {
+    "calculate_reactions_batch": "termo_batch",
+    "sweep_temperatures": "termo_sweep",
+    "Uncertainties": "termo_uncertainty",
+    "propagate_uncertainty": "termo_uncertainty",
+}
+
+def __getattr__(name):
+    "Import the NumPy-backed batch features on first use."
+    if name in _LAZY:
+        import importlib
+        return getattr(importlib.import_module(_LAZY[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@instrumented("termo.lookup_property")
+def lookup_property(df: Union["pd.DataFrame", ThermoTable], substance: str, property_name: str) -> float:
     """
     Retrieve a thermodynamic property for a given substance.
     
     Parameters
     ----------
-    df : pd.DataFrame
-        DataFrame with columns: 'Substance', 'H', 'G', 'E'
+    df : pd.DataFrame or ThermoTable
+        DataFrame with columns: 'Substance', 'H', 'G', 'E', or a ThermoTable
+        built from it (O(1) lookups, use this one in hot loops)
     substance : str
         Chemical formula (e.g., "Na2SO4(s)", "Na+(aq)")
     property_name : str
         Property to retrieve: "H", "G", or "E"
     """
-    
+    if isinstance(df, ThermoTable):
+        return df.lookup(substance, property_name)
+
     # Error check like who cares?
     allowed_props = {"H", "G", "E"}
     if property_name not in allowed_props:
@@ -28,7 +56,8 @@ def lookup_property(df: pd.DataFrame, substance: str, property_name: str) -> flo
     value = df.loc[df["Substance"] == substance, property_name].iloc[0]
     return float(value)
 
-def calculate_reaction(df: pd.DataFrame,
+@instrumented("termo.calculate_reaction")
+def calculate_reaction(df: Union["pd.DataFrame", ThermoTable],
                      reactants: Dict,
                      products: Dict, 
                      property_name: str) -> float:
@@ -43,14 +72,15 @@ def calculate_reaction(df: pd.DataFrame,
     sigma_p = sum(coeff * lookup_property(df, substance, property_name) 
                   for substance, coeff in products.items())
     
-    return np.round(sigma_p - sigma_r, 3)
+    return round3(sigma_p - sigma_r)
 
+@instrumented("termo.get_molarmass")
 def get_molarmass(formula: str) -> float:
-    "Gets the molarmass."
-    substance = Substance.from_formula(formula)
-    if substance is None or substance.mass is None:
-        raise ValueError(f"Could not determine molar mass for formula: {formula}")
-    return float(substance.mass)
+    "Gets the molarmass (cached, see molarmass.py; chempy not needed)."
+    try:
+        return molar_mass(formula)
+    except ValueError:
+        raise ValueError(f"Could not determine molar mass for formula: {formula}") from None
 
 def celsius_kelvin(celsius):
     return celsius + 273.15
@@ -59,9 +89,6 @@ def kelvin_celsius(kelvin):
     return kelvin - 273.15
     
 if __name__ == '__main__':
-    from chempy import Substance
-    from sympy import symbols, solve, Eq, ln
-
     """
     # Template
     reactants_q = {}
@@ -69,80 +96,81 @@ if __name__ == '__main__':
     ans_ = calculate_reaction(apx2, reactants_q, products_q, "H")
     print(f"Question : ΔH°rxn = {ans_}")
     """
-    apx2 = pd.read_csv("data/Appendix2.csv")
+    # TERMO_PROFILE=1 prints per-stage timings to stderr, TERMO_TRACE=trace.json
+    # also writes a Chrome trace (chrome://tracing, ui.perfetto.dev)
+    import os
+    import sys
+    import termo_instrument
+    if os.environ.get("TERMO_PROFILE") or os.environ.get("TERMO_TRACE"):
+        termo_instrument.enable(trace=bool(os.environ.get("TERMO_TRACE")))
+
+    try:
+        apx2 = load_table("data/Appendix2.csv")
     
-    # Question 7
-    reactants_q7 = {"Na2SO4(s)": 1}
-    products_q7 = {"Na+(aq)": 2, "SO4--(aq)": 1}
-    ans_7 = calculate_reaction(apx2, reactants_q7, products_q7, "H")
-    print(f"Question 7: ΔH°rxn = {ans_7} kJ/mol")
+        # Question 7
+        reactants_q7 = {"Na2SO4(s)": 1}
+        products_q7 = {"Na+(aq)": 2, "SO4--(aq)": 1}
+        ans_7 = calculate_reaction(apx2, reactants_q7, products_q7, "H")
+        print(f"Question 7: ΔH°rxn = {ans_7} kJ/mol")
     
-    # Question 9
-    reactants_q9 = {"C6H12O6(s)": 1, "O2(g)": 6}
-    products_q9 = {"CO2(g)": 6, "H2O(l)": 6}
-    ans_9 = calculate_reaction(apx2, reactants_q9, products_q9, "H")
-    print(f"Question 9: ΔH°rxn = {ans_9} kJ/mol")
+        # Question 9
+        reactants_q9 = {"C6H12O6(s)": 1, "O2(g)": 6}
+        products_q9 = {"CO2(g)": 6, "H2O(l)": 6}
+        ans_9 = calculate_reaction(apx2, reactants_q9, products_q9, "H")
+        print(f"Question 9: ΔH°rxn = {ans_9} kJ/mol")
     
-    # Question 10
-    deltaH = ans_9
-    m_glu = 10
-    n_glu = 10/get_molarmass('C6H12O6')
-    ans_10 = deltaH * n_glu
-    print(f'Question 10: {ans_10:.2f} kj')
+        # Question 10
+        deltaH = ans_9
+        m_glu = 10
+        n_glu = 10/get_molarmass('C6H12O6')
+        ans_10 = deltaH * n_glu
+        print(f'Question 10: {ans_10:.2f} kj')
     
-    # Question 11
-    reactants_q11 = {"Na2SO4(s)": 1}
-    products_q11 = {"Na+(aq)": 2, "SO4--(aq)": 1}
-    ans_11 = calculate_reaction(apx2, reactants_q11, products_q11, "E")    
-    print(f"Question 11: = {ans_11}")
+        # Question 11
+        reactants_q11 = {"Na2SO4(s)": 1}
+        products_q11 = {"Na+(aq)": 2, "SO4--(aq)": 1}
+        ans_11 = calculate_reaction(apx2, reactants_q11, products_q11, "E")    
+        print(f"Question 11: = {ans_11}")
     
-    # Question 12
-    reactants_q12 = {'Na2SO4(s)': 1}
-    products_q12 = {'Na+(aq)': 2, "SO4--(aq)": 1}
-    ans_12 = calculate_reaction(apx2, reactants_q12, products_q12, "G")
-    print(f"Question 12: ΔH°rxn = {ans_12}")
+        # Question 12
+        reactants_q12 = {'Na2SO4(s)': 1}
+        products_q12 = {'Na+(aq)': 2, "SO4--(aq)": 1}
+        ans_12 = calculate_reaction(apx2, reactants_q12, products_q12, "G")
+        print(f"Question 12: ΔH°rxn = {ans_12}")
     
-    # Question 14
-    T = symbols('T')
-    H = 5.4 * 10**3
-    S = 18
-    equation = H - T*S
-    solution = solve(equation, T)
-    print(f"Question 14: {solution[0]:.2f}")
+        # Question 14
+        H = 5.4 * 10**3
+        S = 18
+        solution = crossover_temperature(H, S)  # ΔG = H - T*S = 0
+        print(f"Question 14: {solution:.2f}")
     
-    # Question 15
-    ## Initialize
-    R, T, K, G = symbols('R T K G')
-    equation = Eq(G, -R*T*ln(K))  # Standard form: ΔG = -RT ln(K)
-
-    ## Info from question
-    R_val = 8.314  # J/(mol·K)
-    K_val = 2.5e-3
-    T_val = celsius_kelvin(800)
-    G_val = 'Unknown'
-
-    ## Solve
-    G_solution = solve(equation.subs([(R, R_val), (T, T_val), (K, K_val)]), G)
-    print(f"Question 15: ΔG = {G_solution[0]:.2f} J/mol")
-
-    # Question 16
-    ## Initialize
-    R, T, K, G = symbols('R T K G')
-    equation = Eq(G, -R*T*ln(K))  # Standard form: ΔG = -RT ln(K)
-
-    ## Info from question
-    R_val = 8.314  # J/(mol·K)
-    T_val = celsius_kelvin(25)
-    G_val = 'Unknown'
-    K_val = 'Unknown'
-
-    ## Step 1: Calculate ΔG from reaction
-    reactants_q16 = {"SO2(g)": 2, "O2(g)": 1}
-    products_q16 = {"SO3(g)": 2}
-    G_val = calculate_reaction(apx2, reactants_q16, products_q16, "G")
-    print(f"Question 16 - Step 1: ΔG = {G_val:.2f} J/mol")
-
-    ## Step 2: Solve for K
-    K_solution = solve(equation.subs([(R, R_val), (T, T_val), (G, G_val*1000)]), K)
-    print(f"Question 16 - Step 2: K = {K_solution[0]:.2e}")
-    
\ No newline at end of file
+        # Question 15
+        ## Info from question
+        R_val = 8.314  # J/(mol·K)
+        K_val = 2.5e-3
+        T_val = celsius_kelvin(800)
+
+        ## Solve ΔG = -RT ln(K)
+        G_solution = delta_g_from_k(K_val, T_val, R_val)
+        print(f"Question 15: ΔG = {G_solution:.2f} J/mol")
+
+        # Question 16
+        ## Info from question
+        R_val = 8.314  # J/(mol·K)
+        T_val = celsius_kelvin(25)
+
+        ## Step 1: Calculate ΔG from reaction
+        reactants_q16 = {"SO2(g)": 2, "O2(g)": 1}
+        products_q16 = {"SO3(g)": 2}
+        G_val = calculate_reaction(apx2, reactants_q16, products_q16, "G")
+        print(f"Question 16 - Step 1: ΔG = {G_val:.2f} J/mol")
+
+        ## Step 2: Solve ΔG = -RT ln(K) for K
+        K_solution = k_from_delta_g(G_val*1000, T_val, R_val)
+        print(f"Question 16 - Step 2: K = {K_solution:.2e}")
+    finally:
+        prof = termo_instrument.disable()
+    if prof is not None:
+        print(prof.summary(), file=sys.stderr)
+        if os.environ.get("TERMO_TRACE"):
+            prof.write_trace(os.environ["TERMO_TRACE"])
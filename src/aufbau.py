@@ -0,0 +1,492 @@
+"""
+Precomputed Aufbau electron configurations for 0..118 electrons.
+
+Everything is built once at import from the same walk over the Aufbau order
+that `electron_config` in 5-atomOpbygning.py used to do on every call, so
+the table is identical to it by construction; lookups are then O(1).
+Only the standard library is needed, NumPy is imported by
+`electron_configs` when it's used.
+
+`ground_state(Z, charge)` adds the known ground-state exceptions (Cr, Cu,
+Ag, Au, ...) and cations that lose their valence electrons in the usual
+order: outermost np and ns, then (n-1)d, then (n-2)f (Fe2+ is [Ar] 3d^6,
+not [Ar] 4s^2 3d^4; Nd3+ is [Xe] 4f^3). The whole Z x charge grid is
+computed once on first use.
+"""
+
+SUBSHELLS = (
+    '1s', '2s', '2p', '3s', '3p', '4s', '3d', '4p', '5s', '4d',
+    '5p', '6s', '4f', '5d', '6p', '7s', '5f', '6d', '7p'
+)
+
+MAX_ELECTRONS = {'s': 2, 'p': 6, 'd': 10, 'f': 14}
+CAPACITY = tuple(MAX_ELECTRONS[s[-1]] for s in SUBSHELLS)
+MAX_N = sum(CAPACITY)  # 118
+
+L_VALUES = {'s': 0, 'p': 1, 'd': 2, 'f': 3}
+SUBSHELL_INDEX = {s: i for i, s in enumerate(SUBSHELLS)}
+
+NOBLE_GASES = ((2, 'He'), (10, 'Ne'), (18, 'Ar'), (36, 'Kr'), (54, 'Xe'), (86, 'Rn'), (118, 'Og'))
+
+
+def aufbau_walk(n):
+    """
+    Fill n electrons into the subshells in Aufbau order.
+
+    Args:
+        n (int): Number of electrons
+
+    Returns:
+        tuple: Electrons per subshell, in the order of SUBSHELLS
+    """
+    remaining = n
+    occupancy = []
+    for capacity in CAPACITY:
+        electrons = min(max(remaining, 0), capacity)
+        occupancy.append(electrons)
+        remaining -= electrons
+    return tuple(occupancy)
+
+
+def format_config(occupancy):
+    """Format an occupancy tuple as "1s^2 2s^2 2p^6 ..." (empty subshells left out)."""
+    return " ".join(f"{s}^{e}" for s, e in zip(SUBSHELLS, occupancy) if e)
+
+
+def _abbreviate(n, full):
+    core = None
+    for electrons, symbol in NOBLE_GASES:
+        if electrons < n:
+            core = (electrons, symbol)
+    if core is None:
+        return full
+    # Aufbau fills in order, so the core's configuration is a prefix of ours
+    core_config = _STRINGS[core[0]]
+    return f"[{core[1]}] {full[len(core_config) + 1:]}"
+
+
+# Built once at import: 119 x 19 occupancies packed in one bytes object,
+# the formatted strings and their noble-gas-core abbreviations.
+OCCUPANCY = tuple(aufbau_walk(n) for n in range(MAX_N + 1))
+_PACKED = bytes(e for occ in OCCUPANCY for e in occ)
+_STRINGS = tuple(format_config(occ) for occ in OCCUPANCY)
+_ABBREVIATED = tuple(_abbreviate(n, s) for n, s in enumerate(_STRINGS))
+
+_occupancy_array = None
+
+
+def _check(n):
+    if not 0 <= n <= MAX_N:
+        raise ValueError(f"Number of electrons must be between 0 and {MAX_N}, got {n}")
+
+
+def occupancy(n):
+    """Electrons per subshell for n electrons, as a tuple in the order of SUBSHELLS."""
+    _check(n)
+    return OCCUPANCY[n]
+
+
+def config_string(n, abbreviated=False):
+    """
+    Electron configuration string for n electrons.
+
+    Args:
+        n (int): Number of electrons, 0..118
+        abbreviated (bool): Use a noble-gas core, e.g. "[Ar] 4s^2 3d^9"
+
+    Returns:
+        str: Electron configuration (e.g. "1s^2 2s^2 2p^6 3s^1")
+    """
+    _check(n)
+    return _ABBREVIATED[n] if abbreviated else _STRINGS[n]
+
+
+def occupancy_array():
+    """Read-only (119, 19) uint8 NumPy view of the whole table, no copy."""
+    global _occupancy_array
+    if _occupancy_array is None:
+        import numpy as np
+        _occupancy_array = np.frombuffer(_PACKED, dtype=np.uint8).reshape(MAX_N + 1, len(SUBSHELLS))
+    return _occupancy_array
+
+
+def electron_configs(ns):
+    """
+    Vectorized lookup of many electron counts at once.
+
+    Args:
+        ns (array-like of int): Electron counts, 0..118
+
+    Returns:
+        np.ndarray: (len(ns), 19) uint8 occupancy matrix, columns follow SUBSHELLS
+    """
+    import numpy as np
+    ns = np.asarray(ns)
+    if ns.size and (ns.min() < 0 or ns.max() > MAX_N):
+        raise ValueError(f"Number of electrons must be between 0 and {MAX_N}")
+    return occupancy_array()[ns]
+
+
+# Neutral-atom ground states that differ from Aufbau (NIST), as the
+# subshells that change. Z = 110, 111 etc. are only predicted and left out.
+EXCEPTIONS = {
+    24: {'4s': 1, '3d': 5},             # Cr
+    29: {'4s': 1, '3d': 10},            # Cu
+    41: {'5s': 1, '4d': 4},             # Nb
+    42: {'5s': 1, '4d': 5},             # Mo
+    44: {'5s': 1, '4d': 7},             # Ru
+    45: {'5s': 1, '4d': 8},             # Rh
+    46: {'5s': 0, '4d': 10},            # Pd
+    47: {'5s': 1, '4d': 10},            # Ag
+    57: {'4f': 0, '5d': 1},             # La
+    58: {'4f': 1, '5d': 1},             # Ce
+    64: {'4f': 7, '5d': 1},             # Gd
+    78: {'6s': 1, '5d': 9},             # Pt
+    79: {'6s': 1, '5d': 10},            # Au
+    89: {'5f': 0, '6d': 1},             # Ac
+    90: {'5f': 0, '6d': 2},             # Th
+    91: {'5f': 2, '6d': 1},             # Pa
+    92: {'5f': 3, '6d': 1},             # U
+    93: {'5f': 4, '6d': 1},             # Np
+    96: {'5f': 7, '6d': 1},             # Cm
+    103: {'6d': 0, '7p': 1},            # Lr
+}
+
+MAX_Z = MAX_N
+MIN_CHARGE = -4  # most negative ion charge in the grid
+
+# Core electrons (once the valence subshells are empty) go from the highest
+# n first, highest l within a shell
+REMOVAL_ORDER = tuple(sorted(range(len(SUBSHELLS)),
+                             key=lambda i: (int(SUBSHELLS[i][:-1]), L_VALUES[SUBSHELLS[i][-1]]),
+                             reverse=True))
+
+
+# Valence shell each subshell belongs to: n for ns/np, n+1 for nd, n+2 for nf
+_SHELL = tuple(int(s[:-1]) + {'s': 0, 'p': 0, 'd': 1, 'f': 2}[s[-1]] for s in SUBSHELLS)
+
+
+def _removal_order(n):
+    # Outermost np, ns, then (n-1)d, then (n-2)f, then the core
+    valence = tuple(SUBSHELL_INDEX[s] for s in (f"{n}p", f"{n}s", f"{n - 1}d", f"{n - 2}f")
+                    if s in SUBSHELL_INDEX)
+    return valence + tuple(i for i in REMOVAL_ORDER if i not in valence)
+
+
+_REMOVAL_ORDERS = tuple(_removal_order(n) for n in range(max(_SHELL) + 1))
+
+
+def _valence_shell(occ):
+    return max((shell for shell, electrons in zip(_SHELL, occ) if electrons), default=0)
+
+
+def _remove_electrons(occ, count):
+    """
+    Take `count` electrons out of the occupancy list `occ` in place:
+    outermost np, ns, then (n-1)d, then (n-2)f, then the core by
+    REMOVAL_ORDER. The valence shell n is the outermost one occupied, so
+    Pd ([Kr] 4d^10) still counts as shell 5. Returns how many couldn't be
+    removed.
+    """
+    for i in _REMOVAL_ORDERS[_valence_shell(occ)]:
+        if not count:
+            break
+        taken = min(occ[i], count)
+        occ[i] -= taken
+        count -= taken
+    return count
+
+
+_CHARGES = MAX_Z - MIN_CHARGE + 1  # columns of the grid, charge MIN_CHARGE..MAX_Z
+_grid = None
+
+
+def _neutral_ground_state(Z):
+    occ = list(OCCUPANCY[Z])
+    for subshell, electrons in EXCEPTIONS.get(Z, {}).items():
+        occ[SUBSHELL_INDEX[subshell]] = electrons
+    return occ
+
+
+def _ion(Z, charge):
+    occ = _neutral_ground_state(Z)
+    if charge > 0:
+        _remove_electrons(occ, charge)
+    elif charge < 0:
+        add = -charge
+        for i, capacity in enumerate(CAPACITY):
+            put = min(capacity - occ[i], add)
+            occ[i] += put
+            add -= put
+            if not add:
+                break
+    return occ
+
+
+def _build_grid():
+    global _grid
+    size = len(SUBSHELLS)
+    grid = bytearray(size * (MAX_Z + 1) * _CHARGES)
+    for Z in range(1, MAX_Z + 1):
+        for charge in range(MIN_CHARGE, 1):
+            if Z - charge > MAX_N:
+                continue
+            start = ((Z * _CHARGES) + charge - MIN_CHARGE) * size
+            grid[start:start + size] = bytes(_ion(Z, charge))
+        # The removal order is fixed by the neutral atom, so each cation is
+        # the previous one minus the next electron in that order
+        occ = _neutral_ground_state(Z)
+        order = iter(_REMOVAL_ORDERS[_valence_shell(occ)])
+        i = next(order)
+        start = ((Z * _CHARGES) - MIN_CHARGE) * size
+        for charge in range(1, Z + 1):
+            while not occ[i]:
+                i = next(order)
+            occ[i] -= 1
+            start += size
+            grid[start:start + size] = bytes(occ)
+    _grid = bytes(grid)
+    return _grid
+
+
+def _check_ion(Z, charge):
+    if not 1 <= Z <= MAX_Z:
+        raise ValueError(f"Atomic number must be between 1 and {MAX_Z}, got {Z}")
+    if not MIN_CHARGE <= charge <= Z or Z - charge > MAX_N:
+        raise ValueError(f"Charge {charge:+d} not supported for Z = {Z}")
+
+
+def ground_state(Z, charge=0):
+    """
+    Ground-state occupancy of an atom or ion.
+
+    Args:
+        Z (int): Atomic number, 1..118
+        charge (int): Ion charge, e.g. 2 for Fe2+ or -2 for O2-
+
+    Returns:
+        Configuration: Electrons per subshell (19 bytes, order of SUBSHELLS)
+    """
+    _check_ion(Z, charge)
+    grid = _grid or _build_grid()
+    start = ((Z * _CHARGES) + charge - MIN_CHARGE) * len(SUBSHELLS)
+    return Configuration._trusted(grid[start:start + len(SUBSHELLS)])
+
+
+def ground_state_config(Z, charge=0, abbreviated=False):
+    """
+    Ground-state configuration string, e.g. ground_state_config(29) gives
+    "1s^2 2s^2 2p^6 3s^2 3p^6 4s^1 3d^10".
+
+    Args:
+        Z (int): Atomic number, 1..118
+        charge (int): Ion charge
+        abbreviated (bool): Use a noble-gas core when the configuration contains it
+
+    Returns:
+        str: Electron configuration
+    """
+    occ = ground_state(Z, charge)
+    full = format_config(occ)
+    if abbreviated:
+        for electrons, symbol in reversed(NOBLE_GASES):
+            core = OCCUPANCY[electrons]
+            if electrons < sum(occ) and all(o == c for c, o in zip(core, occ) if c):
+                rest = tuple(0 if c else o for c, o in zip(core, occ))
+                return f"[{symbol}] {format_config(rest)}"
+    return full
+
+
+BLOCKS = 'spdf'
+
+
+def ground_state_array():
+    """
+    Read-only (119, 123, 19) uint8 NumPy view of the whole Z x charge grid,
+    no copy. Index it with [Z, charge_index(charge)]; unsupported
+    combinations are all zeros.
+    """
+    import numpy as np
+    grid = _grid or _build_grid()
+    return np.frombuffer(grid, dtype=np.uint8).reshape(MAX_Z + 1, _CHARGES, len(SUBSHELLS))
+
+
+def charge_index(charge):
+    """Column of `charge` in the grid and the per-ion descriptor arrays (works on arrays too)."""
+    return charge - MIN_CHARGE
+
+
+class _Descriptors:
+    __slots__ = ('valence', 'unpaired', 'paramagnetic', 'valid', 'block', 'period', 'group')
+
+
+_descriptors = None
+
+
+def descriptors():
+    """
+    Atomic descriptors as NumPy arrays, computed once from the occupancy
+    model and cached, so feature extraction is an array gather:
+    ``d.valence[Z, charge_index(q)]``.
+
+    Per ion, shape (119, 123), index [Z, charge_index(charge)]:
+        valence: Electrons outside the noble-gas core, not counting filled
+            inner d/f subshells (Fe 8, Fe2+ 6, Ga 3, Zn 2, O2- 8)
+        unpaired: Unpaired electrons by Hund's rule
+        paramagnetic: unpaired > 0 (False means diamagnetic)
+        valid: Whether the (Z, charge) combination is in the grid
+
+    Per element, shape (119,), index [Z], from the Aufbau configuration:
+        block: 0..3 for s, p, d, f (see BLOCKS), -1 for Z = 0
+        period: Highest occupied shell
+        group: IUPAC group 1..18, 0 for the f-block and Z = 0
+
+    Returns:
+        An object with the arrays above as attributes (all read-only)
+    """
+    global _descriptors
+    if _descriptors is not None:
+        return _descriptors
+
+    import numpy as np
+
+    occ = ground_state_array().astype(np.int16)
+    cap = np.array(CAPACITY, dtype=np.int16)
+    n_of = np.array([int(s[:-1]) for s in SUBSHELLS])
+    l_of = np.array([L_VALUES[s[-1]] for s in SUBSHELLS])
+    total = occ.sum(axis=-1)
+
+    d = _Descriptors()
+    Z = np.arange(MAX_Z + 1)[:, None]
+    charges = np.arange(MIN_CHARGE, MAX_Z + 1)[None, :]
+    d.valid = (Z >= 1) & (charges <= Z) & (Z - charges <= MAX_N)
+
+    half = cap // 2
+    d.unpaired = np.where(occ <= half, occ, cap - occ).sum(axis=-1)
+    d.paramagnetic = d.unpaired > 0
+
+    # Largest noble-gas core fully contained in the configuration
+    core_mask = np.zeros(occ.shape, dtype=bool)
+    for electrons, _ in NOBLE_GASES:
+        core = np.array(OCCUPANCY[electrons], dtype=np.int16)
+        inside = core > 0
+        fits = np.all(occ[..., inside] == core[inside], axis=-1) & (total > electrons)
+        core_mask[fits] = inside
+    outer = np.where(core_mask, 0, occ)
+    n_max = np.where(occ > 0, n_of, 0).max(axis=-1)
+    pseudo_core = (l_of >= 2) & (outer == cap) & (n_of < n_max[..., None])
+    d.valence = np.where(pseudo_core, 0, outer).sum(axis=-1)
+
+    aufbau = occupancy_array()
+    last = np.where(aufbau > 0, np.arange(len(SUBSHELLS)), -1).max(axis=-1)
+    d.block = np.where(last >= 0, l_of[last], -1)
+    d.period = np.where(aufbau > 0, n_of, 0).max(axis=-1)
+    last_count = aufbau[np.arange(MAX_N + 1), last].astype(np.int16)
+    d.group = np.select(
+        [last < 0, d.block == 0, d.block == 1, d.block == 2],
+        [0, last_count, 12 + last_count, 2 + last_count],
+        default=0,
+    )
+    d.group[2] = 18  # He
+
+    for name in _Descriptors.__slots__:
+        getattr(d, name).setflags(write=False)
+    _descriptors = d
+    return d
+
+
+_SUPERSCRIPTS = str.maketrans('0123456789', '⁰¹²³⁴⁵⁶⁷⁸⁹')
+
+
+class Configuration(bytes):
+    """
+    Electron configuration as 19 occupancy bytes, one per subshell in the
+    order of SUBSHELLS.
+
+    Being a bytes subclass with no instance dict it costs a small fixed
+    amount per object, hashes and compares as fast as bytes, and can be
+    viewed without copying (memoryview, `as_array`). Text forms are only
+    rendered when asked for.
+
+    Subtracting two configurations gives the occupancy delta (a tuple of
+    signed ints), adding a delta applies it:
+
+    >>> cu, cu1 = ground_state(29), ground_state(29, 1)
+    >>> cu1 + (cu - cu1) == cu
+    True
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, occupancy=bytes(len(SUBSHELLS))):
+        self = bytes.__new__(cls, occupancy)
+        if len(self) != len(SUBSHELLS):
+            raise ValueError(f"Expected {len(SUBSHELLS)} subshells, got {len(self)}")
+        if any(e > c for e, c in zip(self, CAPACITY)):
+            raise ValueError(f"Occupancy over capacity: {tuple(self)}")
+        return self
+
+    @classmethod
+    def _trusted(cls, occupancy):
+        # Grid/table data is valid by construction, skip the checks
+        return bytes.__new__(cls, occupancy)
+
+    @classmethod
+    def from_string(cls, text):
+        """Parse "1s^2 2s^2 2p^6" (or "1s2 2s2 2p6")."""
+        occ = [0] * len(SUBSHELLS)
+        for token in text.split():
+            subshell, count = token[:2], token[2:].lstrip('^')
+            occ[SUBSHELL_INDEX[subshell]] = int(count)
+        return cls(occ)
+
+    @property
+    def electrons(self):
+        return sum(self)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return bytes.__getitem__(self, SUBSHELL_INDEX[key])
+        return bytes.__getitem__(self, key)
+
+    def __sub__(self, other):
+        if not isinstance(other, bytes):
+            return NotImplemented
+        return tuple(a - b for a, b in zip(self, other))
+
+    def __add__(self, delta):
+        if isinstance(delta, bytes) and not isinstance(delta, Configuration):
+            return NotImplemented
+        return Configuration(a + b for a, b in zip(self, delta))
+
+    def ionize(self, charge=1):
+        """Remove `charge` electrons in the same order as `ground_state` makes cations."""
+        occ = list(self)
+        if _remove_electrons(occ, charge):
+            raise ValueError(f"Cannot remove {charge} electrons from {self.electrons}")
+        return Configuration._trusted(bytes(occ))
+
+    def as_array(self):
+        """Zero-copy read-only uint8 NumPy view."""
+        import numpy as np
+        return np.frombuffer(self, dtype=np.uint8)
+
+    def __str__(self):
+        return format_config(self)
+
+    def __repr__(self):
+        return f"Configuration('{format_config(self)}')"
+
+    def latex(self):
+        """E.g. "1s^{2} 2s^{2} 2p^{6}"."""
+        return " ".join(f"{s}^{{{e}}}" for s, e in zip(SUBSHELLS, self) if e)
+
+    def superscript(self):
+        """E.g. "1s² 2s² 2p⁶"."""
+        return " ".join(f"{s}{str(e).translate(_SUPERSCRIPTS)}" for s, e in zip(SUBSHELLS, self) if e)
+
+
+def configuration(n):
+    """Aufbau configuration for n electrons as a Configuration."""
+    _check(n)
+    return Configuration._trusted(_PACKED[n * len(SUBSHELLS):(n + 1) * len(SUBSHELLS)])
@@ -0,0 +1,176 @@
+"""
+Reaction balancing from species lists.
+
+Builds the element (+ charge) composition matrix from parsed formulas, so
+ionic Appendix 2 names like "SO4--(aq)" and "Al+++(aq)" work, and solves
+for its integer nullspace exactly with integer-only elimination. Solutions
+are cached by species set, so balancing the same reaction again in a screen
+is a dict hit.
+"""
+from functools import lru_cache, reduce
+from math import gcd
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+from molarmass import parse_formula
+
+CACHE_SIZE = 65536
+
+OK = "ok"
+UNDERDETERMINED = "underdetermined"  # several independent reactions fit
+OVERDETERMINED = "overdetermined"    # no reaction fits at all
+INFEASIBLE = "infeasible"            # only with a species on the wrong side / absent
+PARSE_ERROR = "parse error"
+
+
+class BalanceResult(NamedTuple):
+    reactants: Dict[str, int]
+    products: Dict[str, int]
+    status: str
+
+
+def composition_matrix(species: Sequence[str]) -> Tuple[List[str], List[List[int]]]:
+    """
+    Rows are elements (sorted) plus a final "charge" row, columns follow
+    `species`. Raises ValueError for formulas that can't be parsed.
+    """
+    parsed = [parse_formula(s) for s in species]
+    elements = sorted({el for p in parsed for el, _ in p.composition})
+    rows = [[dict(p.composition).get(el, 0) for p in parsed] for el in elements]
+    if any(p.charge for p in parsed):
+        elements.append("charge")
+        rows.append([p.charge for p in parsed])
+    return elements, rows
+
+
+def nullspace(matrix: List[List[int]], n_cols: int) -> List[List[int]]:
+    """
+    Exact nullspace basis of an integer matrix, as primitive integer vectors.
+
+    Fraction-free Gauss-Jordan elimination: rows stay integer (divided by
+    their gcd after each step), which is several times faster than
+    Fractions on the small matrices reactions give.
+    """
+    rows = [list(row) for row in matrix if any(row)]
+    pivots = []
+    r = 0
+    for c in range(n_cols):
+        pivot = next((i for i in range(r, len(rows)) if rows[i][c] != 0), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        pr = rows[r]
+        p = pr[c]
+        for i in range(len(rows)):
+            if i != r and rows[i][c] != 0:
+                f = rows[i][c]
+                row = [p * a - f * b for a, b in zip(rows[i], pr)]
+                g = reduce(gcd, row, 0) or 1
+                rows[i] = [v // g for v in row]
+        pivots.append(c)
+        r += 1
+        if r == len(rows):
+            break
+
+    basis = []
+    for free in (c for c in range(n_cols) if c not in pivots):
+        # x_free = L, x_p = -row[free] * L / row[p] with L the lcm of the pivots
+        lcm = 1
+        for row, p in zip(rows, pivots):
+            lcm = lcm * abs(row[p]) // gcd(lcm, abs(row[p]))
+        vec = [0] * n_cols
+        vec[free] = lcm
+        for row, p in zip(rows, pivots):
+            vec[p] = -row[free] * lcm // row[p]
+        g = reduce(gcd, vec, 0) or 1
+        basis.append([v // g for v in vec])
+    return basis
+
+
+def _orient(vec: List[int]) -> List[int]:
+    "Flip the sign so a valid reaction comes out with positive coefficients."
+    if sum(vec) < 0:
+        vec = [-v for v in vec]
+    return vec
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _solve(reactants: Tuple[str, ...], products: Tuple[str, ...]) -> Tuple[Tuple[int, ...], str]:
+    species = reactants + products
+    try:
+        _, rows = composition_matrix(species)
+    except ValueError:
+        return (), PARSE_ERROR
+
+    # Products enter with a minus sign so a balanced reaction is M x = 0, x > 0
+    n_r = len(reactants)
+    signed = [row[:n_r] + [-v for v in row[n_r:]] for row in rows]
+    basis = nullspace(signed, len(species))
+
+    if not basis:
+        return (), OVERDETERMINED
+    if len(basis) > 1:
+        return (), UNDERDETERMINED
+    coeffs = _orient(basis[0])
+    if any(c <= 0 for c in coeffs):
+        return tuple(coeffs), INFEASIBLE
+    return tuple(coeffs), OK
+
+
+def balance_species(reactants: Iterable[str], products: Iterable[str]) -> BalanceResult:
+    """
+    Smallest positive integer coefficients, or a status saying why not.
+
+    The cache key is the sorted species on each side, so the same species
+    set in any order is only solved once.
+    """
+    reactants = list(reactants)
+    products = list(products)
+    key_r = tuple(sorted(set(reactants)))
+    key_p = tuple(sorted(set(products)))
+    if len(key_r) != len(reactants) or len(key_p) != len(products):
+        raise ValueError("Species listed twice on the same side")
+
+    coeffs, status = _solve(key_r, key_p)
+    if status != OK:
+        return BalanceResult({}, {}, status)
+    by_name = dict(zip(key_r + key_p, coeffs))
+    return BalanceResult({s: by_name[s] for s in reactants}, {s: by_name[s] for s in products}, OK)
+
+
+def balance(reactants: Iterable[str], products: Iterable[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Balance a reaction, e.g.
+
+    >>> balance(["C6H12O6(s)", "O2(g)"], ["CO2(g)", "H2O(l)"])
+    ({'C6H12O6(s)': 1, 'O2(g)': 6}, {'CO2(g)': 6, 'H2O(l)': 6})
+
+    The dicts can go straight into `calculate_reaction`. Raises ValueError
+    if the reaction can't be balanced uniquely.
+    """
+    result = balance_species(reactants, products)
+    if result.status != OK:
+        raise ValueError(f"Cannot balance reaction: {result.status}")
+    return result.reactants, result.products
+
+
+def balance_batch(reactions: Iterable[Tuple[Sequence[str], Sequence[str]]]) -> List[BalanceResult]:
+    "Balance many (reactants, products) species lists, flagging failures instead of raising."
+    results = []
+    for reactants, products in reactions:
+        try:
+            results.append(balance_species(reactants, products))
+        except ValueError:
+            results.append(BalanceResult({}, {}, PARSE_ERROR))
+    return results
+
+
+def is_balanced(reactants: Dict[str, float], products: Dict[str, float]) -> bool:
+    "Check hand-entered coefficients (e.g. for `calculate_reaction`): atoms and charge conserved."
+    total = {}
+    for sign, side in ((1, reactants), (-1, products)):
+        for substance, coeff in side.items():
+            parsed = parse_formula(substance)
+            for el, n in parsed.composition:
+                total[el] = total.get(el, 0) + sign * coeff * n
+            total["charge"] = total.get("charge", 0) + sign * coeff * parsed.charge
+    return all(abs(v) < 1e-9 for v in total.values())
@@ -0,0 +1,147 @@
+"""
+Enumerate balanced reactions over the Appendix 2 species and keep the
+thermodynamically most favourable ones.
+
+Each species gets a bitmask of its elements. Atoms can only be conserved if
+both sides cover the same elements, so product combinations are indexed by
+their mask and a reactant combination only ever meets the product
+combinations with the same mask; everything else is pruned before any
+balancing. Only the mask multisets behind each union mask are indexed; the
+species combinations themselves are generated on demand. Survivors are
+balanced exactly (balancer.py), evaluated in blocks with the batch engine
+and fed to a bounded heap, so memory stays flat.
+"""
+import heapq
+from itertools import chain, combinations, combinations_with_replacement, islice, product
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from balancer import OK, balance_species
+from molarmass import parse_formula
+from termo_batch import calculate_reactions_batch
+from termo_table import ThermoTable
+
+
+class Candidate(NamedTuple):
+    G: float
+    reactants: Dict[str, int]
+    products: Dict[str, int]
+
+
+def element_masks(species: Iterable[str]) -> Dict[str, int]:
+    "Bitmask of the elements in each species (unparseable species are left out)."
+    bits = {}
+    masks = {}
+    for s in species:
+        try:
+            parsed = parse_formula(s)
+        except ValueError:
+            continue
+        mask = 0
+        for el, _ in parsed.composition:
+            mask |= 1 << bits.setdefault(el, len(bits))
+        masks[s] = mask
+    return masks
+
+
+def _mask_groups(masks: Dict[str, int]) -> Dict[int, List[str]]:
+    "Species grouped by element mask."
+    groups = {}
+    for name in sorted(masks):
+        groups.setdefault(masks[name], []).append(name)
+    return groups
+
+
+def _keys_by_mask(groups: Dict[int, List[str]], max_size: int) -> Dict[int, List[Tuple[int, ...]]]:
+    """
+    Union mask -> the multisets of species masks (sorted tuples, a mask
+    repeated at most as often as it has species) that give it. There are far
+    fewer distinct masks than species, so this stays small where storing
+    every C(n, k) species combination did not.
+    """
+    index = {}
+    for size in range(1, max_size + 1):
+        for key in combinations_with_replacement(sorted(groups), size):
+            if any(key.count(m) > len(groups[m]) for m in set(key)):
+                continue
+            mask = 0
+            for m in key:
+                mask |= m
+            index.setdefault(mask, []).append(key)
+    return index
+
+
+def _combos(groups: Dict[int, List[str]], keys: List[Tuple[int, ...]]) -> Iterator[Tuple[str, ...]]:
+    "Species combinations for the mask multisets `keys`, generated lazily."
+    for key in keys:
+        picks = [combinations(groups[m], key.count(m)) for m in sorted(set(key))]
+        for picked in product(*picks):
+            yield tuple(chain.from_iterable(picked))
+
+
+def enumerate_reactions(table: ThermoTable, max_reactants: int = 2, max_products: int = 2,
+                        max_coefficient: int = 10,
+                        species: Optional[Sequence[str]] = None) -> Iterator[Tuple[Dict[str, int], Dict[str, int]]]:
+    """
+    Yield every uniquely balanced (reactants, products) pair with up to
+    `max_reactants`/`max_products` species and coefficients <= `max_coefficient`.
+
+    Parameters
+    ----------
+    table : ThermoTable
+        Appendix 2 table, its substances are the species space by default
+    species : Sequence[str], optional
+        Restrict the search to these species
+    """
+    groups = _mask_groups(element_masks(species if species is not None else table.substances))
+    reactant_index = _keys_by_mask(groups, max_reactants)
+    product_index = (reactant_index if max_products == max_reactants
+                     else _keys_by_mask(groups, max_products))
+
+    for mask, reactant_keys in reactant_index.items():
+        product_keys = product_index.get(mask)
+        if not product_keys:
+            continue
+        for reactants in _combos(groups, reactant_keys):
+            for products in _combos(groups, product_keys):
+                if not set(reactants).isdisjoint(products):
+                    continue
+                result = balance_species(reactants, products)
+                if result.status != OK:
+                    continue
+                if max(*result.reactants.values(), *result.products.values()) > max_coefficient:
+                    continue
+                yield result.reactants, result.products
+
+
+def top_reactions(table: ThermoTable, k: int = 10, max_reactants: int = 2, max_products: int = 2,
+                  max_coefficient: int = 10, species: Optional[Sequence[str]] = None,
+                  block_size: int = 4096) -> List[Candidate]:
+    """
+    The k reactions with the most negative ΔG°rxn, best first.
+
+    Candidates are evaluated `block_size` at a time with the vectorized
+    batch path; only a k-sized heap is kept between blocks. Reactions with
+    a missing ("?") ΔG° value are skipped.
+    """
+    if not isinstance(table, ThermoTable):
+        table = ThermoTable.from_dataframe(table)
+
+    heap = []  # max-heap on ΔG via (-ΔG, seq, reactants, products)
+    seq = 0
+    stream = enumerate_reactions(table, max_reactants, max_products, max_coefficient, species)
+    while True:
+        block = list(islice(stream, block_size))
+        if not block:
+            break
+        G = calculate_reactions_batch(table, block).column("G")
+        for i in np.flatnonzero(~np.isnan(G)):
+            g = float(G[i])
+            if len(heap) < k:
+                heapq.heappush(heap, (-g, seq, *block[i]))
+            elif g < -heap[0][0]:
+                heapq.heapreplace(heap, (-g, seq, *block[i]))
+            seq += 1
+
+    return [Candidate(-neg_g, r, p) for neg_g, _, r, p in sorted(heap, key=lambda e: (-e[0], e[1]))]
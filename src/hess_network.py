@@ -0,0 +1,165 @@
+"""
+Hess's-law reaction network for species missing from Appendix 2.
+
+Every known reaction value gives one linear equation
+    Σ ν_j X_j(unknown) = ΔX_rxn - Σ ν_k X_k(table)
+per property X in H, G, E. The system is solved in the least-squares sense
+(exact if it's square, best fit if over-determined). Each property keeps a
+QR factorization of its system that is updated with Givens rotations when a
+reaction is added, so adding reactions one at a time never refactors the
+whole system. The result is a new ThermoTable that `calculate_reaction`
+(and everything else taking a table) can use directly.
+"""
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from termo_table import PROPERTIES, ThermoTable
+
+
+class _IncrementalQR:
+    """
+    R and z = Qᵀb of a growing least-squares system A x ≈ b, updated one
+    row at a time. Columns (unknown species) can be added on the fly.
+    """
+
+    def __init__(self):
+        self.columns: Dict[str, int] = {}
+        self.R = np.zeros((0, 0))
+        self.z = np.zeros(0)
+        self.rss = 0.0  # residual sum of squares
+        self.n_rows = 0
+        self._solution = None
+
+    def _grow(self, name: str) -> None:
+        k = len(self.columns)
+        self.columns[name] = k
+        R = np.zeros((k + 1, k + 1))
+        R[:k, :k] = self.R
+        self.R = R
+        self.z = np.append(self.z, 0.0)
+
+    def add_row(self, coeffs: Dict[str, float], rhs: float) -> None:
+        for name in coeffs:
+            if name not in self.columns:
+                self._grow(name)
+
+        a = np.zeros(len(self.columns))
+        for name, c in coeffs.items():
+            a[self.columns[name]] += c
+        beta = rhs
+
+        R, z = self.R, self.z
+        for i in range(a.size):
+            if a[i] == 0.0:
+                continue
+            h = math.hypot(R[i, i], a[i])
+            c, s = R[i, i] / h, a[i] / h
+            row = R[i, i:].copy()
+            R[i, i:] = c * row + s * a[i:]
+            a[i:] = -s * row + c * a[i:]
+            z[i], beta = c * z[i] + s * beta, -s * z[i] + c * beta
+
+        self.rss += beta * beta
+        self.n_rows += 1
+        self._solution = None
+
+    def solve(self, tol: float = 1e-9):
+        """
+        Least-squares values and a mask of the unknowns that are actually
+        determined (not in the nullspace of A). Cached until the next row.
+        """
+        if self._solution is None:
+            k = len(self.columns)
+            if k == 0:
+                self._solution = (np.zeros(0), np.zeros(0, dtype=bool))
+            else:
+                x = np.linalg.lstsq(self.R, self.z, rcond=None)[0]
+                _, sv, vt = np.linalg.svd(self.R)
+                null = vt[sv <= tol * max(sv.max(initial=0.0), 1.0)]
+                determined = np.all(np.abs(null) <= 1e-8, axis=0) if null.size else np.ones(k, dtype=bool)
+                self._solution = (x, determined)
+        return self._solution
+
+
+class ReactionNetwork:
+    """
+    Derive missing formation data from known reaction values.
+
+    Parameters
+    ----------
+    table : ThermoTable
+        Appendix 2 table; species not in it, or with a "?" value, are the unknowns
+    """
+
+    def __init__(self, table: ThermoTable):
+        if not isinstance(table, ThermoTable):
+            table = ThermoTable.from_dataframe(table)
+        self.table = table
+        self._systems = {prop: _IncrementalQR() for prop in PROPERTIES}
+
+    def _known(self, substance: str, property_name: str) -> Optional[float]:
+        if substance not in self.table:
+            return None
+        value = self.table.column(property_name)[self.table.index(substance)]
+        return None if math.isnan(value) else value
+
+    def add_reaction(self, reactants: Dict, products: Dict,
+                     H: Optional[float] = None, G: Optional[float] = None, E: Optional[float] = None) -> None:
+        """
+        Add a reaction with its measured ΔH°, ΔG° and/or ΔS° (same units as
+        Appendix 2: kJ/mol and J/(mol·K)). Only the given properties are used.
+        """
+        for prop, value in (("H", H), ("G", G), ("E", E)):
+            if value is None:
+                continue
+            coeffs = {}
+            rhs = float(value)
+            for sign, side in ((-1.0, reactants), (1.0, products)):
+                for substance, coeff in side.items():
+                    known = self._known(substance, prop)
+                    if known is None:
+                        coeffs[substance] = coeffs.get(substance, 0.0) + sign * coeff
+                    else:
+                        rhs -= sign * coeff * known
+            coeffs = {s: c for s, c in coeffs.items() if c != 0.0}
+            if coeffs:
+                self._systems[prop].add_row(coeffs, rhs)
+
+    def solve(self, property_name: str) -> Dict[str, float]:
+        "Derived values of the unknowns that the reactions pin down."
+        if property_name not in PROPERTIES:
+            raise ValueError(f"Invalid property '{property_name}'. Must be one of {set(PROPERTIES)}")
+        system = self._systems[property_name]
+        x, determined = system.solve()
+        return {name: float(x[i]) for name, i in system.columns.items() if determined[i]}
+
+    def undetermined(self, property_name: str) -> List[str]:
+        "Unknowns that appear in reactions but aren't fixed by them."
+        system = self._systems[property_name]
+        _, determined = system.solve()
+        return [name for name, i in system.columns.items() if not determined[i]]
+
+    def residual(self, property_name: str) -> float:
+        "RMS misfit of the reactions (0 unless the system is over-determined and inconsistent)."
+        system = self._systems[property_name]
+        return math.sqrt(system.rss / system.n_rows) if system.n_rows else 0.0
+
+    def derived_table(self) -> ThermoTable:
+        """
+        Appendix 2 plus the derived values: "?" entries that got solved are
+        filled in and new species are appended as rows (NaN where unknown).
+        """
+        solved = {prop: self.solve(prop) for prop in PROPERTIES}
+        new = [s for prop in PROPERTIES for s in self._systems[prop].columns if s not in self.table]
+        substances = list(self.table.substances) + list(dict.fromkeys(new))
+
+        columns = {}
+        for prop in PROPERTIES:
+            values = list(self.table.column(prop)) + [math.nan] * (len(substances) - len(self.table))
+            for substance, value in solved[prop].items():
+                row = self.table.index(substance) if substance in self.table else substances.index(substance)
+                values[row] = value
+            columns[prop] = values
+        return ThermoTable(substances, columns)
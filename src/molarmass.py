@@ -0,0 +1,168 @@
+"""
+Molar masses from chemical formulas without chempy.
+
+Understands the notation used in Appendix 2: parentheses/brackets
+("(NH2)2CO"), hydrates ("CuSO4·5H2O"), charges ("Na+", "Al+++", "SO4--",
+"SO4-2", "SO4^2-") and phase suffixes ("(aq)", "(s)", "(graphite)", ...).
+Results are kept in bounded LRU caches, chempy is only used by `cross_check`.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from termo_instrument import register_cache
+
+# Standard atomic weights (same values as chempy.util.periodic)
+ATOMIC_WEIGHTS: Dict[str, float] = {
+    "H": 1.008, "He": 4.002602, "Li": 6.94, "Be": 9.0121831, "B": 10.81, "C": 12.011,
+    "N": 14.007, "O": 15.999, "F": 18.998403163, "Ne": 20.1797, "Na": 22.98976928, "Mg": 24.305,
+    "Al": 26.9815384, "Si": 28.085, "P": 30.973761998, "S": 32.06, "Cl": 35.45, "Ar": 39.95,
+    "K": 39.0983, "Ca": 40.078, "Sc": 44.955908, "Ti": 47.867, "V": 50.9415, "Cr": 51.9961,
+    "Mn": 54.938043, "Fe": 55.845, "Co": 58.933194, "Ni": 58.6934, "Cu": 63.546, "Zn": 65.38,
+    "Ga": 69.723, "Ge": 72.63, "As": 74.921595, "Se": 78.971, "Br": 79.904, "Kr": 83.798,
+    "Rb": 85.4678, "Sr": 87.62, "Y": 88.90584, "Zr": 91.224, "Nb": 92.90637, "Mo": 95.95,
+    "Tc": 98.0, "Ru": 101.07, "Rh": 102.90549, "Pd": 106.42, "Ag": 107.8682, "Cd": 112.414,
+    "In": 114.818, "Sn": 118.71, "Sb": 121.76, "Te": 127.6, "I": 126.90447, "Xe": 131.293,
+    "Cs": 132.90545196, "Ba": 137.327, "La": 138.90547, "Ce": 140.116, "Pr": 140.90766, "Nd": 144.242,
+    "Pm": 145.0, "Sm": 150.36, "Eu": 151.964, "Gd": 157.25, "Tb": 158.925354, "Dy": 162.5,
+    "Ho": 164.930328, "Er": 167.259, "Tm": 168.934218, "Yb": 173.045, "Lu": 174.9668, "Hf": 178.486,
+    "Ta": 180.94788, "W": 183.84, "Re": 186.207, "Os": 190.23, "Ir": 192.217, "Pt": 195.084,
+    "Au": 196.96657, "Hg": 200.592, "Tl": 204.38, "Pb": 207.2, "Bi": 208.9804, "Po": 209.0,
+    "At": 210.0, "Rn": 222.0, "Fr": 223.0, "Ra": 226.0, "Ac": 227.0, "Th": 232.0377,
+    "Pa": 231.03588, "U": 238.02891, "Np": 237.0, "Pu": 244.0, "Am": 243.0, "Cm": 247.0,
+    "Bk": 247.0, "Cf": 251.0, "Es": 252.0, "Fm": 257.0, "Md": 258.0, "No": 259.0,
+    "Lr": 266.0, "Rf": 267.0, "Db": 268.0, "Sg": 269.0, "Bh": 270.0, "Hs": 271.0,
+    "Mt": 278.0, "Ds": 281.0, "Rg": 282.0, "Cn": 285.0, "Nh": 286.0, "Fl": 289.0,
+    "Mc": 290.0, "Lv": 293.0, "Ts": 294.0, "Og": 294.0,
+}
+
+ELECTRON_MASS = 5.489e-4  # u, subtracted per unit of positive charge like chempy does
+
+CACHE_SIZE = 4096
+
+# "(aq)", "(s)", "(graphite)" ... groups of elements always start upper case
+_PHASE = re.compile(r"\(([a-z]+)\)$")
+# "Al+++", "SO4-2", "SO4^2-", "Fe^+3"
+_CHARGE = re.compile(r"(?:\^(\d*)([+-])|\^?([+-])(\d+)|([+-]+))$")
+_TOKEN = re.compile(r"([A-Z][a-z]?)(\d*)|([(\[])|([)\]])(\d*)")
+_HYDRATE = re.compile(r"[·•*.]")
+_LEADING_COUNT = re.compile(r"^(\d+)")
+
+
+class Formula(NamedTuple):
+    """Parsed formula: sorted (element, count) pairs, net charge and phase."""
+    composition: Tuple[Tuple[str, int], ...]
+    charge: int
+    phase: Optional[str]
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(self.composition)
+
+
+def _parse_body(body: str, formula: str) -> Dict[str, int]:
+    stack = [{}]
+    pos = 0
+    while pos < len(body):
+        m = _TOKEN.match(body, pos)
+        if m is None:
+            raise ValueError(f"Could not parse formula: {formula}")
+        element, count, opening, closing, group_count = m.groups()
+        if element:
+            if element not in ATOMIC_WEIGHTS:
+                raise ValueError(f"Unknown element '{element}' in formula: {formula}")
+            stack[-1][element] = stack[-1].get(element, 0) + int(count or 1)
+        elif opening:
+            stack.append({})
+        else:
+            if len(stack) == 1:
+                raise ValueError(f"Unbalanced parentheses in formula: {formula}")
+            group = stack.pop()
+            mult = int(group_count or 1)
+            for el, n in group.items():
+                stack[-1][el] = stack[-1].get(el, 0) + n * mult
+        pos = m.end()
+
+    if len(stack) != 1:
+        raise ValueError(f"Unbalanced parentheses in formula: {formula}")
+    return stack[0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_formula(formula: str) -> Formula:
+    """
+    Parse e.g. "SO4--(aq)" into Formula((('O', 4), ('S', 1)), -2, 'aq').
+
+    Raises ValueError if the formula can't be parsed.
+    """
+    body = formula.strip()
+    phase = None
+    m = _PHASE.search(body)
+    if m:
+        phase = m.group(1)
+        body = body[:m.start()]
+
+    charge = 0
+    m = _CHARGE.search(body)
+    if m:
+        caret_n, caret_sign, sign, sign_n, signs = m.groups()
+        if signs:
+            charge = len(signs) if signs[0] == "+" else -len(signs)
+            if len(set(signs)) != 1:
+                raise ValueError(f"Could not parse charge in formula: {formula}")
+        else:
+            n = int(caret_n or sign_n or 1)
+            charge = n if (caret_sign or sign) == "+" else -n
+        body = body[:m.start()]
+
+    composition = {}
+    for part in _HYDRATE.split(body):
+        mult = 1
+        m = _LEADING_COUNT.match(part)
+        if m:
+            mult = int(m.group(1))
+            part = part[m.end():]
+        if not part:
+            raise ValueError(f"Could not parse formula: {formula}")
+        for el, n in _parse_body(part, formula).items():
+            composition[el] = composition.get(el, 0) + n * mult
+
+    return Formula(tuple(sorted(composition.items())), charge, phase)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def molar_mass(formula: str) -> float:
+    "Molar mass in g/mol. Raises ValueError if the formula can't be parsed."
+    parsed = parse_formula(formula)
+    mass = sum(ATOMIC_WEIGHTS[el] * n for el, n in parsed.composition)
+    return mass - parsed.charge * ELECTRON_MASS
+
+
+register_cache("molarmass.parse_formula", parse_formula)
+register_cache("molarmass.molar_mass", molar_mass)
+
+
+def molar_masses(formulas: Iterable[str]):
+    "Bulk `molar_mass` as a NumPy array, NaN for formulas that can't be parsed."
+    import numpy as np
+
+    def _mass(formula):
+        try:
+            return molar_mass(formula)
+        except ValueError:
+            return np.nan
+
+    return np.fromiter(map(_mass, formulas), dtype=np.float64)
+
+
+def cross_check(formula: str, rel_tol: float = 1e-6) -> bool:
+    """
+    Compare `molar_mass` with chempy (optional dependency, imported here).
+
+    chempy can't read repeated-sign charges or phase names like
+    "(graphite)", so this is only meaningful for formulas it understands.
+    """
+    from chempy import Substance
+
+    theirs = Substance.from_formula(formula).mass
+    ours = molar_mass(formula)
+    return abs(ours - theirs) <= rel_tol * max(abs(theirs), 1.0)
@@ -0,0 +1,96 @@
+"""
+Screen capture for ocr_tool.py.
+
+The overlay grabs the whole screen once; the selection is then cropped out
+of that frame instead of taking a second screenshot after the overlay
+closes (which costs another capture and can catch the overlay fading
+out). Sources are swappable, so the capture -> OCR path can run from an
+image file without a display.
+"""
+from typing import Optional, Tuple
+
+from PIL import Image
+
+Box = Tuple[int, int, int, int]
+
+
+class Frame:
+    """
+    One full-screen capture.
+
+    Parameters
+    ----------
+    image : PIL.Image.Image
+        The capture in physical pixels
+    logical_size : (int, int), optional
+        Screen size in the coordinates the selection comes in (Tk's
+        winfo_screenwidth/height). On HiDPI screens (Retina, Windows scaling)
+        the capture has more pixels than that; the ratio is the scale used
+        to map a selection onto the image. Defaults to the image size.
+    """
+
+    __slots__ = ("image", "logical_size", "scale")
+
+    def __init__(self, image: Image.Image, logical_size: Optional[Tuple[int, int]] = None):
+        if logical_size is None:
+            logical_size = image.size
+        self.image = image
+        self.logical_size = logical_size
+        self.scale = (image.width / logical_size[0], image.height / logical_size[1])
+
+    def to_pixels(self, x1: int, y1: int, x2: int, y2: int) -> Box:
+        "Selection (logical coordinates, any corner order) -> clamped pixel box."
+        sx, sy = self.scale
+        left, right = sorted((x1, x2))
+        top, bottom = sorted((y1, y2))
+        width, height = self.image.size
+        return (min(max(round(left * sx), 0), width), min(max(round(top * sy), 0), height),
+                min(max(round(right * sx), 0), width), min(max(round(bottom * sy), 0), height))
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int) -> Image.Image:
+        """
+        The selected region. Pillow has no image views, so this copies the
+        selected pixels only, never the full frame.
+        """
+        return self.image.crop(self.to_pixels(x1, y1, x2, y2))
+
+
+class CaptureSource:
+    "Where frames come from."
+
+    def grab(self, logical_size: Optional[Tuple[int, int]] = None) -> Frame:
+        raise NotImplementedError
+
+
+class ScreenCapture(CaptureSource):
+    "The real screen via pyautogui (imported on first use)."
+
+    def grab(self, logical_size: Optional[Tuple[int, int]] = None) -> Frame:
+        import pyautogui
+        return Frame(pyautogui.screenshot(), logical_size)
+
+
+class ImageFileCapture(CaptureSource):
+    """
+    A fixed image instead of the screen, for headless runs and tests.
+
+    Parameters
+    ----------
+    source : str or PIL.Image.Image
+        Path of the image, or the image itself
+    logical_size : (int, int), optional
+        Pretend screen size, e.g. half the image size to simulate a 2x
+        HiDPI screen. A size passed to `grab` wins over this one.
+    """
+
+    def __init__(self, source, logical_size: Optional[Tuple[int, int]] = None):
+        if isinstance(source, Image.Image):
+            image = source
+        else:
+            with Image.open(source) as f:
+                image = f.convert("RGB")
+        self.image = image
+        self.logical_size = logical_size
+
+    def grab(self, logical_size: Optional[Tuple[int, int]] = None) -> Frame:
+        return Frame(self.image, logical_size or self.logical_size)
@@ -0,0 +1,364 @@
+"""
+OCR backends for ocr_tool.py.
+
+`pytesseract.image_to_string` writes the image to a temp file and starts a
+new tesseract process per call, which loads the language model every time.
+The engines here keep a Tesseract instance loaded between captures:
+
+- TesserocrEngine: tesserocr's PyTessBaseAPI, in process
+- LibTesseractEngine: the same through libtesseract's C API with ctypes,
+  for when tesseract is installed but tesserocr isn't
+- WorkerPoolEngine: long-lived worker processes each holding one of the
+  above, images go over pipes as raw pixels. Captures run in parallel up to
+  the pool size and a Tesseract crash can't take the GUI down.
+- PytesseractEngine: the old per-call subprocess, fallback and baseline
+
+`create_engine()` picks the best one available.
+"""
+import ctypes
+import ctypes.util
+import glob
+import multiprocessing
+import os
+import queue
+import threading
+from typing import List, Optional
+
+from PIL import Image
+
+PSM_AUTO = 3          # tesseract's default, what a plain image_to_string uses
+PSM_SINGLE_BLOCK = 6  # "--psm 6", the chemistry engine in ocr_tool.py
+
+BACKENDS = ("tesserocr", "libtesseract", "pytesseract")
+
+
+class OCREngine:
+    """
+    Recognize text in PIL images. Engines are thread-safe (one
+    recognition at a time per Tesseract instance) and usable as context
+    managers.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def recognize(self, image: Image.Image, psm: Optional[int] = None) -> str:
+        with self._lock:
+            return self._recognize(image, PSM_AUTO if psm is None else psm)
+
+    def _recognize(self, image: Image.Image, psm: int) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class PytesseractEngine(OCREngine):
+    "One tesseract process per call (cold, the old behaviour)."
+
+    name = "pytesseract"
+
+    def __init__(self, lang: str = "eng", tesseract_cmd: Optional[str] = None):
+        super().__init__()
+        import pytesseract
+        if tesseract_cmd:
+            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def recognize(self, image: Image.Image, psm: Optional[int] = None) -> str:
+        # Separate processes, no need to serialize
+        config = "" if psm is None else f"--oem 3 --psm {psm}"
+        return self._pytesseract.image_to_string(image, lang=self.lang, config=config)
+
+
+class TesserocrEngine(OCREngine):
+    "tesserocr's PyTessBaseAPI, model loaded once."
+
+    name = "tesserocr"
+
+    def __init__(self, lang: str = "eng", datapath: Optional[str] = None):
+        super().__init__()
+        import tesserocr
+        kwargs = {"lang": lang}
+        if datapath:
+            kwargs["path"] = datapath
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def _recognize(self, image: Image.Image, psm: int) -> str:
+        self._api.SetPageSegMode(psm)
+        self._api.SetImage(image)
+        return self._api.GetUTF8Text()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._api is not None:
+                self._api.End()
+                self._api = None
+
+
+def find_libtesseract(tesseract_cmd: Optional[str] = None) -> Optional[str]:
+    """
+    Path of the libtesseract shared library, or None. On Windows the DLL
+    sits next to tesseract.exe, so pass the `tesseract_cmd` you set for
+    pytesseract.
+    """
+    if tesseract_cmd:
+        directory = os.path.dirname(tesseract_cmd)
+        for pattern in ("libtesseract*.dll", "tesseract*.dll", "libtesseract*.so*", "libtesseract*.dylib"):
+            found = sorted(glob.glob(os.path.join(directory, pattern)))
+            if found:
+                return found[-1]
+    return ctypes.util.find_library("tesseract") or ctypes.util.find_library("libtesseract-5")
+
+
+def _declare(lib) -> None:
+    "Signatures of the parts of the Tesseract C API (capi.h) used here."
+    p, i = ctypes.c_void_p, ctypes.c_int
+    lib.TessBaseAPICreate.restype = p
+    lib.TessBaseAPICreate.argtypes = []
+    lib.TessBaseAPIInit3.restype = i
+    lib.TessBaseAPIInit3.argtypes = [p, ctypes.c_char_p, ctypes.c_char_p]
+    lib.TessBaseAPISetPageSegMode.restype = None
+    lib.TessBaseAPISetPageSegMode.argtypes = [p, i]
+    lib.TessBaseAPISetImage.restype = None
+    lib.TessBaseAPISetImage.argtypes = [p, ctypes.c_char_p, i, i, i, i]
+    lib.TessBaseAPIGetUTF8Text.restype = p  # freed with TessDeleteText
+    lib.TessBaseAPIGetUTF8Text.argtypes = [p]
+    lib.TessDeleteText.restype = None
+    lib.TessDeleteText.argtypes = [p]
+    for name in ("TessBaseAPIClear", "TessBaseAPIEnd", "TessBaseAPIDelete"):
+        getattr(lib, name).restype = None
+        getattr(lib, name).argtypes = [p]
+
+
+class LibTesseractEngine(OCREngine):
+    """
+    libtesseract through ctypes, model loaded once. ctypes releases the
+    GIL during the recognition, so the Tk main loop keeps running.
+    """
+
+    name = "libtesseract"
+
+    _BYTES_PER_PIXEL = {"L": 1, "RGB": 3, "RGBA": 4}
+
+    def __init__(self, lang: str = "eng", datapath: Optional[str] = None,
+                 library: Optional[str] = None, tesseract_cmd: Optional[str] = None):
+        super().__init__()
+        path = library or find_libtesseract(tesseract_cmd)
+        if path is None:
+            raise OSError("libtesseract not found")
+        lib = ctypes.CDLL(path)
+        _declare(lib)
+        api = lib.TessBaseAPICreate()
+        if lib.TessBaseAPIInit3(api, datapath.encode() if datapath else None, lang.encode()) != 0:
+            lib.TessBaseAPIDelete(api)
+            raise RuntimeError(f"Tesseract could not load language '{lang}'")
+        self._lib = lib
+        self._api = api
+
+    def _recognize(self, image: Image.Image, psm: int) -> str:
+        if image.mode not in self._BYTES_PER_PIXEL:
+            image = image.convert("L")
+        bpp = self._BYTES_PER_PIXEL[image.mode]
+        width, height = image.size
+        lib, api = self._lib, self._api
+        lib.TessBaseAPISetPageSegMode(api, psm)
+        lib.TessBaseAPISetImage(api, image.tobytes(), width, height, bpp, width * bpp)
+        ptr = lib.TessBaseAPIGetUTF8Text(api)
+        try:
+            return ctypes.string_at(ptr).decode("utf-8") if ptr else ""
+        finally:
+            if ptr:
+                lib.TessDeleteText(ptr)
+            lib.TessBaseAPIClear(api)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._api is not None:
+                self._lib.TessBaseAPIEnd(self._api)
+                self._lib.TessBaseAPIDelete(self._api)
+                self._api = None
+
+
+def in_process_engine(backend: str = "auto", lang: str = "eng", datapath: Optional[str] = None,
+                      tesseract_cmd: Optional[str] = None) -> OCREngine:
+    """
+    A single engine in this process. "auto" tries tesserocr, then
+    libtesseract, then falls back to pytesseract.
+    """
+    if backend == "tesserocr":
+        return TesserocrEngine(lang, datapath)
+    if backend == "libtesseract":
+        return LibTesseractEngine(lang, datapath, tesseract_cmd=tesseract_cmd)
+    if backend == "pytesseract":
+        return PytesseractEngine(lang, tesseract_cmd)
+    if backend != "auto":
+        raise ValueError(f"Unknown OCR backend '{backend}'. Must be one of {BACKENDS + ('auto',)}")
+    try:
+        return TesserocrEngine(lang, datapath)
+    except (ImportError, RuntimeError):
+        pass
+    try:
+        return LibTesseractEngine(lang, datapath, tesseract_cmd=tesseract_cmd)
+    except (OSError, AttributeError, RuntimeError):  # missing library / symbols / language data
+        pass
+    return PytesseractEngine(lang, tesseract_cmd)
+
+
+def _serve(conn, backend: str, lang: str, datapath: Optional[str], tesseract_cmd: Optional[str]) -> None:
+    "Worker process: load one engine, then recognize images until told to stop."
+    try:
+        engine = in_process_engine(backend, lang, datapath, tesseract_cmd)
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    conn.send(("ready", engine.name))
+    with engine:
+        while True:
+            try:
+                request = conn.recv()
+            except (EOFError, KeyboardInterrupt):
+                break
+            if request is None:
+                break
+            mode, size, data, psm = request
+            try:
+                conn.send(("ok", engine.recognize(Image.frombytes(mode, size, data), psm)))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    def __init__(self, ctx, args):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_serve, args=(child,) + args, daemon=True)
+        self.process.start()
+        child.close()
+        self.engine_name = None
+
+    def wait_ready(self) -> None:
+        if self.engine_name is None:
+            status, payload = self.conn.recv()
+            if status != "ready":
+                raise RuntimeError(f"OCR worker failed to start: {payload}")
+            self.engine_name = payload
+
+    def stop(self, timeout: float = 2.0) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPoolEngine(OCREngine):
+    """
+    `size` long-lived worker processes, each with a warm in-process engine.
+
+    Workers start loading their models right away in the background; the
+    first recognition waits for its worker to be ready. A worker that dies
+    is replaced and the call raises RuntimeError.
+
+    Parameters
+    ----------
+    size : int
+        Number of workers, i.e. captures recognized in parallel
+    backend : str
+        Engine inside the workers, see `in_process_engine`
+    start_method : str
+        multiprocessing start method; spawn by default so workers don't
+        inherit the GUI's Tk/X state
+    """
+
+    def __init__(self, size: int = 2, backend: str = "auto", lang: str = "eng",
+                 datapath: Optional[str] = None, tesseract_cmd: Optional[str] = None,
+                 start_method: Optional[str] = "spawn"):
+        super().__init__()
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._ctx = multiprocessing.get_context(start_method)
+        self._args = (backend, lang, datapath, tesseract_cmd)
+        self._idle = queue.Queue()
+        self._workers: List[_Worker] = []
+        for _ in range(size):
+            self._spawn()
+        self.size = size
+        self.name = f"pool[{size}]"
+
+    def _spawn(self) -> None:
+        worker = _Worker(self._ctx, self._args)
+        self._workers.append(worker)
+        self._idle.put(worker)
+
+    def warm_up(self) -> str:
+        "Wait until every worker has loaded its model; returns the engine they use."
+        workers = [self._idle.get() for _ in range(self.size)]
+        try:
+            for worker in workers:
+                worker.wait_ready()
+        finally:
+            for worker in workers:
+                self._idle.put(worker)
+        return workers[0].engine_name
+
+    def recognize(self, image: Image.Image, psm: Optional[int] = None) -> str:
+        if image.mode not in ("L", "RGB", "RGBA"):
+            image = image.convert("L")
+        worker = self._idle.get()
+        try:
+            worker.wait_ready()
+            worker.conn.send((image.mode, image.size, image.tobytes(), psm))
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            self._workers.remove(worker)
+            worker.stop(timeout=0)
+            self._spawn()
+            raise RuntimeError("OCR worker died, restarted it") from None
+        except BaseException:
+            self._idle.put(worker)
+            raise
+        self._idle.put(worker)
+        if status != "ok":
+            raise RuntimeError(payload)
+        return payload
+
+    def close(self) -> None:
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+
+def create_engine(backend: str = "auto", pool_size: int = 1, lang: str = "eng",
+                  datapath: Optional[str] = None, tesseract_cmd: Optional[str] = None) -> OCREngine:
+    """
+    OCR engine for ocr_tool.py.
+
+    Parameters
+    ----------
+    backend : str
+        "auto", "tesserocr", "libtesseract" or "pytesseract"
+    pool_size : int
+        1 keeps the engine in this process, more starts a WorkerPoolEngine
+        with that many workers
+    tesseract_cmd : str, optional
+        Path of tesseract(.exe); used by pytesseract and to find the DLL on Windows
+    """
+    if pool_size > 1:
+        return WorkerPoolEngine(pool_size, backend, lang, datapath, tesseract_cmd)
+    return in_process_engine(backend, lang, datapath, tesseract_cmd)
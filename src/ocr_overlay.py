@@ -0,0 +1,125 @@
+"""
+Rendering helpers for the selection overlay in ocr_tool.py.
+
+The overlay used to stack a full-screen RGBA image on the screenshot (two
+full-screen PhotoImages per capture, and Tk blends the alpha layer on every
+repaint) and recreated the selection items on every motion event. Here the
+frame is darkened once with a lookup-table point operation, motion events
+are coalesced to one redraw per display frame, and redraw times are
+collected so the 16 ms budget can be checked.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+from PIL import Image
+
+FRAME_INTERVAL_MS = 16  # ~60 Hz; Tk can't tell us the real refresh rate
+OVERLAY_ALPHA = 100  # same shade as the old (0, 0, 0, 100) layer
+
+
+def darken(image: Image.Image, alpha: int = OVERLAY_ALPHA) -> Image.Image:
+    """
+    `image` as it looks under a black layer of opacity `alpha` (0-255), as
+    one 8-bit lookup per channel instead of an RGBA composite.
+    """
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    keep = (255 - alpha) / 255
+    lut = [round(v * keep) for v in range(256)]
+    return image.point(lut * len(image.getbands()))
+
+
+class FrameStats:
+    "Durations of overlay redraws, in seconds."
+
+    def __init__(self, budget: float = FRAME_INTERVAL_MS / 1000):
+        self.budget = budget
+        self.times: List[float] = []
+        self.events = 0  # motion events received, >= redraws when coalescing
+
+    def record(self, seconds: float):
+        self.times.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        times = sorted(self.times)
+        n = len(times)
+        if not n:
+            return {"frames": 0, "events": self.events}
+        return {
+            "frames": n,
+            "events": self.events,
+            "mean_ms": sum(times) / n * 1e3,
+            "p50_ms": times[n // 2] * 1e3,
+            "p95_ms": times[min(n - 1, int(n * 0.95))] * 1e3,
+            "max_ms": times[-1] * 1e3,
+            "over_budget": sum(t > self.budget for t in times),
+        }
+
+    def report(self) -> str:
+        s = self.summary()
+        if not s["frames"]:
+            return "overlay: no frames drawn"
+        return (f"overlay: {s['frames']} frames for {s['events']} motion events, "
+                f"mean {s['mean_ms']:.2f} ms, p95 {s['p95_ms']:.2f} ms, max {s['max_ms']:.2f} ms, "
+                f"{s['over_budget']} over {self.budget * 1e3:.0f} ms")
+
+
+class MotionCoalescer:
+    """
+    Calls `redraw(x, y)` with the latest pointer position at most once per
+    `interval_ms`. The first event after a quiet period is drawn right
+    away, events arriving faster than that are folded into one redraw
+    scheduled with `widget.after`.
+
+    Parameters
+    ----------
+    widget : tkinter.Misc
+        Any widget, only used for `after` / `after_cancel`
+    redraw : Callable[[int, int], None]
+        Updates the canvas items for a pointer position
+    stats : FrameStats, optional
+        Receives the duration of every redraw, including the forced paint
+    """
+
+    def __init__(self, widget, redraw: Callable[[int, int], None], interval_ms: int = FRAME_INTERVAL_MS,
+                 stats: Optional[FrameStats] = None):
+        self.widget = widget
+        self.redraw = redraw
+        self.interval = interval_ms / 1000
+        self.stats = stats
+        self.pending = None
+        self.position = None
+        self.last = 0.0
+
+    def motion(self, x: int, y: int):
+        self.position = (x, y)
+        if self.stats is not None:
+            self.stats.events += 1
+        if self.pending is not None:
+            return
+        wait = self.last + self.interval - time.perf_counter()
+        if wait <= 0:
+            self._draw()
+        else:
+            self.pending = self.widget.after(max(1, int(wait * 1000)), self._draw)
+
+    def flush(self):
+        "Draw a pending position now (e.g. on button release)."
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self._draw()
+
+    def cancel(self):
+        if self.pending is not None:
+            self.widget.after_cancel(self.pending)
+            self.pending = None
+
+    def _draw(self):
+        self.pending = None
+        t0 = time.perf_counter()
+        self.redraw(*self.position)
+        # Paint now so the measured time includes the canvas update
+        self.widget.update_idletasks()
+        self.last = time.perf_counter()
+        if self.stats is not None:
+            self.stats.record(self.last - t0)
@@ -1,19 +1,96 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font
-import pytesseract
-from PIL import Image, ImageTk, ImageDraw, ImageEnhance, ImageFilter
-import pyautogui
+from PIL import Image, ImageTk, ImageDraw
 import pyperclip
 import threading
 import time
-import numpy as np
 import requests
 import json
 import base64
 from io import BytesIO
 
+import ocr_normalize
+import ocr_preprocess
+from ocr_capture import ImageFileCapture, ScreenCapture
+from ocr_engine import PSM_SINGLE_BLOCK, create_engine
+from ocr_overlay import FrameStats, MotionCoalescer, darken
+
+
+def preprocess_image(image, preset=ocr_preprocess.DEFAULT_PRESET):
+    """Preprocess image for better OCR accuracy (see ocr_preprocess.PRESETS)"""
+    return ocr_preprocess.preprocess(image, preset)
+
+
+def call_mathpix_api(image, api_key):
+    """Call MathPix API for OCR"""
+    # Convert image to base64
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    img_base64 = base64.b64encode(buffered.getvalue()).decode()
+    
+    # Prepare request
+    url = "https://api.mathpix.com/v3/text"
+    headers = {
+        "app_id": "your_app_id",  # Replace with your app_id
+        "app_key": api_key,
+        "Content-type": "application/json"
+    }
+    
+    data = {
+        "src": f"data:image/png;base64,{img_base64}",
+        "formats": ["text", "latex_styled"],
+        "ocr": ["math", "text", "chemistry"]
+    }
+    
+    # Make request
+    response = requests.post(url, json=data, headers=headers)
+    
+    if response.status_code == 200:
+        result = response.json()
+        text = result.get('text', '')
+        latex = result.get('latex_styled', '')
+        return text, latex
+    else:
+        raise Exception(f"MathPix API error: {response.status_code}")
+
+
+def recognize_image(image, engine, tesseract=None, api_key=None, preprocess=ocr_preprocess.DEFAULT_PRESET):
+    """OCR a captured region -> (text, latex). No Tk needed, so it also runs headless"""
+    if engine == "tesseract":
+        # Basic Tesseract OCR with preprocessing
+        processed_image = preprocess_image(image, preprocess)
+        text = tesseract.recognize(processed_image)
+        text = ocr_normalize.chemistry_post_process(text)
+        latex = ocr_normalize.text_to_latex(text)
+        
+    elif engine == "chemistry":
+        # Enhanced chemistry processing
+        processed_image = preprocess_image(image, preprocess)
+        
+        # Use Tesseract as a single text block (--psm 6)
+        text = tesseract.recognize(processed_image, psm=PSM_SINGLE_BLOCK)
+        
+        # Apply aggressive chemistry post-processing
+        text = ocr_normalize.chemistry_post_process(text)
+        latex = ocr_normalize.text_to_latex(text)
+        
+    elif engine == "mathpix":
+        # Use MathPix API
+        if not api_key:
+            raise Exception("Please enter your MathPix API key")
+        
+        text, latex = call_mathpix_api(image, api_key)
+    
+    else:
+        text = "Unknown OCR engine"
+        latex = ""
+    
+    return text, latex
+
+
 class ModernScreenOCR:
-    def __init__(self):
+    def __init__(self, ocr_backend="auto", ocr_pool_size=1, tesseract_cmd=None, capture_source=None,
+                 report_overlay_stats=False, preprocess=ocr_preprocess.DEFAULT_PRESET):
         self.root = tk.Tk()
         self.root.title("Screen OCR Tool - Chemistry Edition")
         self.root.geometry("550x700")
@@ -29,9 +106,29 @@ class ModernScreenOCR:
         self.end_y = None
         self.last_screenshot = None
         
+        # Screen (or an ImageFileCapture for testing), grabbed once per capture
+        self.capture_source = capture_source or ScreenCapture()
+        self.frame = None
+        
+        # Print overlay setup and redraw times after each capture
+        self.report_overlay_stats = report_overlay_stats
+        self.overlay_stats = None
+        
+        # Preprocessing preset (or Pipeline) used before Tesseract
+        self.preprocess = ocr_preprocess.get_pipeline(preprocess)
+        
         # OCR Engine selection
         self.ocr_engine = tk.StringVar(value="tesseract")
         
+        # Warm Tesseract (see ocr_engine.py), loaded in the background so the
+        # first capture doesn't pay for the model load
+        self.ocr_backend = ocr_backend
+        self.ocr_pool_size = ocr_pool_size
+        self.tesseract_cmd = tesseract_cmd
+        self.tesseract = None
+        self.tesseract_lock = threading.Lock()
+        threading.Thread(target=self.get_tesseract, daemon=True).start()
+        
         # Configure styles
         self.setup_styles()
         
@@ -304,8 +401,14 @@ class ModernScreenOCR:
     
     def create_capture_window(self):
         """Create fullscreen overlay for selection"""
-        # Take screenshot
-        screenshot = pyautogui.screenshot()
+        t0 = time.perf_counter()
+        
+        # Take screenshot, the selection is cropped from this same frame later
+        self.frame = self.capture_source.grab((self.root.winfo_screenwidth(), self.root.winfo_screenheight()))
+        screenshot = self.frame.image
+        if self.frame.scale != (1.0, 1.0):
+            # HiDPI: show it at screen size so canvas coordinates are screen coordinates
+            screenshot = screenshot.resize(self.frame.logical_size, Image.Resampling.BILINEAR)
         
         # Create fullscreen window
         self.capture_window = tk.Toplevel()
@@ -319,16 +422,12 @@ class ModernScreenOCR:
                               cursor='crosshair')
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
-        # Display screenshot with darkened overlay
+        # Display the screenshot darkened once, instead of a second
+        # full-screen RGBA image Tk has to blend on every repaint
         self.screenshot = screenshot
-        self.screenshot_image = ImageTk.PhotoImage(screenshot)
+        self.screenshot_image = ImageTk.PhotoImage(darken(screenshot))
         self.canvas.create_image(0, 0, anchor=tk.NW, image=self.screenshot_image)
         
-        # Add dark overlay
-        overlay = Image.new('RGBA', screenshot.size, (0, 0, 0, 100))
-        self.overlay_image = ImageTk.PhotoImage(overlay)
-        self.overlay_id = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.overlay_image)
-        
         # Instructions
         instruction_text = "Click and drag to select chemical equation • Press ESC to cancel"
         self.canvas.create_text(screenshot.width//2, 30, 
@@ -343,8 +442,24 @@ class ModernScreenOCR:
         self.canvas.bind("<ButtonRelease-1>", self.on_release)
         self.capture_window.bind("<Escape>", self.cancel_capture)
         
-        self.selection_rect = None
-        self.coordinates_text = None
+        # Selection items are created once, hidden, and only moved while dragging
+        self.selection_rect = self.canvas.create_rectangle(
+            0, 0, 0, 0,
+            outline="#0e7490", width=2, fill="#0e7490", stipple="gray50",
+            state=tk.HIDDEN
+        )
+        self.coordinates_text = self.canvas.create_text(
+            0, 0,
+            fill="white",
+            font=("Segoe UI", 10, "bold"),
+            anchor="center",
+            state=tk.HIDDEN
+        )
+        
+        # Motion events come in faster than the screen refreshes, draw the latest once per frame
+        self.overlay_stats = FrameStats()
+        self.overlay_setup_time = time.perf_counter() - t0
+        self.drag = MotionCoalescer(self.canvas, self.draw_selection, stats=self.overlay_stats)
     
     def on_click(self, event):
         """Handle mouse click"""
@@ -353,39 +468,38 @@ class ModernScreenOCR:
         
     def on_drag(self, event):
         """Handle mouse drag"""
-        if self.selection_rect:
-            self.canvas.delete(self.selection_rect)
-        if self.coordinates_text:
-            self.canvas.delete(self.coordinates_text)
-        
-        if self.start_x and self.start_y:
-            # Draw selection rectangle
-            self.selection_rect = self.canvas.create_rectangle(
-                self.start_x, self.start_y, event.x, event.y,
-                outline="#0e7490", width=2, fill="#0e7490", stipple="gray50"
-            )
-            
-            # Show dimensions
-            width = abs(event.x - self.start_x)
-            height = abs(event.y - self.start_y)
-            coord_text = f"{width} × {height}"
-            
-            text_x = min(self.start_x, event.x) + width // 2
-            text_y = min(self.start_y, event.y) - 10
-            
-            if text_y < 20:
-                text_y = max(self.start_y, event.y) + 10
-            
-            self.coordinates_text = self.canvas.create_text(
-                text_x, text_y,
-                text=coord_text,
-                fill="white",
-                font=("Segoe UI", 10, "bold"),
-                anchor="center"
-            )
+        if self.start_x is not None and self.start_y is not None:
+            self.drag.motion(event.x, event.y)
+    
+    def draw_selection(self, x, y):
+        """Move the selection rectangle and dimension label to the pointer"""
+        self.canvas.coords(self.selection_rect, self.start_x, self.start_y, x, y)
+        
+        # Show dimensions
+        width = abs(x - self.start_x)
+        height = abs(y - self.start_y)
+        
+        text_x = min(self.start_x, x) + width // 2
+        text_y = min(self.start_y, y) - 10
+        
+        if text_y < 20:
+            text_y = max(self.start_y, y) + 10
+        
+        self.canvas.coords(self.coordinates_text, text_x, text_y)
+        self.canvas.itemconfigure(self.coordinates_text, text=f"{width} × {height}", state=tk.NORMAL)
+        self.canvas.itemconfigure(self.selection_rect, state=tk.NORMAL)
+    
+    def finish_overlay(self):
+        """Stop pending redraws and report overlay timings"""
+        self.drag.cancel()
+        if self.report_overlay_stats:
+            print(f"overlay: setup {self.overlay_setup_time * 1e3:.1f} ms "
+                  f"({self.screenshot.width}x{self.screenshot.height})")
+            print(self.overlay_stats.report())
     
     def on_release(self, event):
         """Handle mouse release"""
+        self.finish_overlay()
         self.end_x = event.x
         self.end_y = event.y
         
@@ -409,6 +523,7 @@ class ModernScreenOCR:
     
     def cancel_capture(self, event):
         """Cancel capture operation"""
+        self.finish_overlay()
         self.capture_window.destroy()
         self.root.deiconify()
         self.root.attributes('-topmost', True)
@@ -416,134 +531,27 @@ class ModernScreenOCR:
     
     def preprocess_image(self, image):
         """Preprocess image for better OCR accuracy"""
-        # Convert to grayscale
-        gray = image.convert('L')
-        
-        # Increase size for better recognition
-        width, height = gray.size
-        gray = gray.resize((width * 3, height * 3), Image.Resampling.LANCZOS)
-        
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(gray)
-        gray = enhancer.enhance(2.5)
-        
-        # Apply sharpening
-        gray = gray.filter(ImageFilter.SHARPEN)
-        
-        # Convert to numpy array for advanced processing
-        img_array = np.array(gray)
-        
-        # Apply threshold
-        threshold = 127
-        img_array = ((img_array > threshold) * 255).astype(np.uint8)
-        
-        return Image.fromarray(img_array)
+        return preprocess_image(image, self.preprocess)
     
     def chemistry_post_process(self, text):
-        """Enhanced post-processing for chemistry notation"""
-        import re
-        
-        # Phase 1: Fix common OCR mistakes
-        replacements = {
-            # Arrows
-            '—>': '→', '-->': '→', '->': '→', '=>': '→',
-            '—»': '→', '-»': '→', '>>': '→',
-            '<->': '↔', '<=>': '⇌', '<==>': '⇌', '==': '⇌',
-            
-            # Mathematical symbols
-            '+-': '±', '+/-': '±',
-            'delta': 'Δ', 'Delta': 'Δ',
-            'alpha': 'α', 'beta': 'β', 'gamma': 'γ',
-            
-            # Fix common letter confusion
-            'S04': 'SO₄', 'H20': 'H₂O', 'C02': 'CO₂',
-            'NH3': 'NH₃', 'CH4': 'CH₄', 'H2S04': 'H₂SO₄',
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-        
-        # Phase 2: Handle subscripts and superscripts
-        
-        # Convert subscript patterns (e.g., H2 -> H₂)
-        subscript_map = str.maketrans('0123456789', '₀₁₂₃₄₅₆₇₈₉')
-        
-        # Find chemical formulas and fix subscripts
-        def fix_subscripts(match):
-            formula = match.group(0)
-            # Replace numbers after letters with subscripts
-            result = re.sub(r'([A-Z][a-z]?)(\d+)', 
-                          lambda m: m.group(1) + m.group(2).translate(subscript_map), 
-                          formula)
-            return result
-        
-        # Apply to common patterns
-        text = re.sub(r'\b[A-Z][a-z]?\d*(?:\([a-z]+\))?(?:[A-Z][a-z]?\d*)*\b', 
-                     fix_subscripts, text)
-        
-        # Handle superscripts for charges
-        superscript_map = str.maketrans('0123456789+-', '⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻')
-        
-        # Fix ion charges (e.g., Na+ -> Na⁺, SO4 2- -> SO₄²⁻)
-        text = re.sub(r'(\w+)\s*(\d*)\s*([+-])', 
-                     lambda m: m.group(1) + m.group(2).translate(superscript_map) + m.group(3).translate(superscript_map),
-                     text)
-        
-        # Fix charges at the beginning (e.g., 2+ -> ²⁺)
-        text = re.sub(r'\b(\d+)([+-])', 
-                     lambda m: m.group(1).translate(superscript_map) + m.group(2).translate(superscript_map),
-                     text)
-        
-        # Phase 3: Clean up spacing
-        text = re.sub(r'\s*([\+→⇌↔])\s*', r' \1 ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        """Enhanced post-processing for chemistry notation (see ocr_normalize.py)"""
+        return ocr_normalize.chemistry_post_process(text)
     
     def perform_ocr(self, x1, y1, x2, y2):
         """Perform OCR on selected region"""
         try:
             self.root.after(0, lambda: self.status_label.config(text="Processing..."))
             
-            # Take screenshot of selected area
-            screenshot = pyautogui.screenshot(region=(x1, y1, x2-x1, y2-y1))
+            # Crop the selected area out of the overlay's screenshot
+            screenshot = self.frame.crop(x1, y1, x2, y2)
             self.last_screenshot = screenshot
             
             # Update preview
             self.update_preview(screenshot)
             
             engine = self.ocr_engine.get()
-            
-            if engine == "tesseract":
-                # Basic Tesseract OCR with preprocessing
-                processed_image = self.preprocess_image(screenshot)
-                text = pytesseract.image_to_string(processed_image)
-                text = self.chemistry_post_process(text)
-                latex = self.text_to_latex(text)
-                
-            elif engine == "chemistry":
-                # Enhanced chemistry processing
-                processed_image = self.preprocess_image(screenshot)
-                
-                # Use Tesseract with custom config
-                custom_config = r'--oem 3 --psm 6'
-                text = pytesseract.image_to_string(processed_image, config=custom_config)
-                
-                # Apply aggressive chemistry post-processing
-                text = self.chemistry_post_process(text)
-                latex = self.text_to_latex(text)
-                
-            elif engine == "mathpix":
-                # Use MathPix API
-                api_key = self.api_key_entry.get()
-                if not api_key:
-                    raise Exception("Please enter your MathPix API key")
-                
-                text, latex = self.call_mathpix_api(screenshot, api_key)
-            
-            else:
-                text = "Unknown OCR engine"
-                latex = ""
+            tesseract = self.get_tesseract() if engine in ("tesseract", "chemistry") else None
+            text, latex = recognize_image(screenshot, engine, tesseract, self.api_key_entry.get(), self.preprocess)
             
             # Update results
             self.root.after(0, lambda: self.update_results(text, latex))
@@ -552,65 +560,12 @@ class ModernScreenOCR:
             self.root.after(0, lambda: self.show_error(f"OCR failed: {str(e)}"))
     
     def text_to_latex(self, text):
-        """Convert text to LaTeX format"""
-        import re
-        
-        # Basic LaTeX conversion
-        latex = text
-        
-        # Convert arrows
-        latex = latex.replace('→', r'\rightarrow')
-        latex = latex.replace('←', r'\leftarrow')
-        latex = latex.replace('↔', r'\leftrightarrow')
-        latex = latex.replace('⇌', r'\rightleftharpoons')
-        
-        # Convert subscripts
-        latex = re.sub(r'([A-Z][a-z]?)([₀-₉]+)', 
-                      lambda m: m.group(1) + '_{' + m.group(2).translate(str.maketrans('₀₁₂₃₄₅₆₇₈₉', '0123456789')) + '}',
-                      latex)
-        
-        # Convert superscripts
-        latex = re.sub(r'([A-Z][a-z]?\d*)([⁰-⁹⁺⁻]+)', 
-                      lambda m: m.group(1) + '^{' + m.group(2).translate(str.maketrans('⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻', '0123456789+-')) + '}',
-                      latex)
-        
-        # Wrap in math mode if not already
-        if not latex.startswith('$'):
-            latex = '$' + latex + '$'
-        
-        return latex
+        """Convert text to LaTeX format (see ocr_normalize.py)"""
+        return ocr_normalize.text_to_latex(text)
     
     def call_mathpix_api(self, image, api_key):
         """Call MathPix API for OCR"""
-        # Convert image to base64
-        buffered = BytesIO()
-        image.save(buffered, format="PNG")
-        img_base64 = base64.b64encode(buffered.getvalue()).decode()
-        
-        # Prepare request
-        url = "https://api.mathpix.com/v3/text"
-        headers = {
-            "app_id": "your_app_id",  # Replace with your app_id
-            "app_key": api_key,
-            "Content-type": "application/json"
-        }
-        
-        data = {
-            "src": f"data:image/png;base64,{img_base64}",
-            "formats": ["text", "latex_styled"],
-            "ocr": ["math", "text", "chemistry"]
-        }
-        
-        # Make request
-        response = requests.post(url, json=data, headers=headers)
-        
-        if response.status_code == 200:
-            result = response.json()
-            text = result.get('text', '')
-            latex = result.get('latex_styled', '')
-            return text, latex
-        else:
-            raise Exception(f"MathPix API error: {response.status_code}")
+        return call_mathpix_api(image, api_key)
     
     def update_preview(self, image):
         """Update preview image"""
@@ -678,11 +633,60 @@ class ModernScreenOCR:
         self.status_label.config(text=f"Error: {message}")
         messagebox.showerror("Error", message)
     
+    def get_tesseract(self):
+        """Warm OCR engine, created on first use"""
+        with self.tesseract_lock:
+            if self.tesseract is None:
+                self.tesseract = create_engine(self.ocr_backend, self.ocr_pool_size,
+                                               tesseract_cmd=self.tesseract_cmd)
+            return self.tesseract
+    
     def run(self):
         """Run the application"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            if self.tesseract is not None:
+                self.tesseract.close()
 
 if __name__ == "__main__":
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(description="Screen OCR tool. With --image the capture -> OCR path "
+                                                 "runs on an image file instead, without the GUI.")
+    parser.add_argument("--image", help="screenshot to use instead of the screen (headless)")
+    parser.add_argument("--box", type=int, nargs=4, metavar=("X1", "Y1", "X2", "Y2"),
+                        help="selection in screen coordinates (default: whole image)")
+    parser.add_argument("--screen-size", type=int, nargs=2, metavar=("W", "H"),
+                        help="logical screen size, to simulate HiDPI scaling")
+    parser.add_argument("--mode", default="tesseract", choices=("tesseract", "chemistry", "mathpix"))
+    parser.add_argument("--tesseract-cmd", help="tesseract executable")
+    parser.add_argument("--preprocess", choices=sorted(ocr_preprocess.PRESETS),
+                        default=os.environ.get("OCR_PREPROCESS", ocr_preprocess.DEFAULT_PRESET),
+                        help="image preprocessing preset before Tesseract (env OCR_PREPROCESS)")
+    args = parser.parse_args()
+    
+    # OCR_BACKEND: auto / tesserocr / libtesseract / pytesseract,
+    # OCR_POOL_SIZE > 1 runs that many Tesseract worker processes
+    ocr_backend = os.environ.get("OCR_BACKEND", "auto")
+    ocr_pool_size = int(os.environ.get("OCR_POOL_SIZE", "1"))
+    
+    if args.image:
+        frame = ImageFileCapture(args.image, args.screen_size and tuple(args.screen_size)).grab()
+        region = frame.crop(*args.box) if args.box else frame.image
+        tesseract = None
+        if args.mode != "mathpix":
+            tesseract = create_engine(ocr_backend, ocr_pool_size, tesseract_cmd=args.tesseract_cmd)
+        try:
+            text, latex = recognize_image(region, args.mode, tesseract, os.environ.get("MATHPIX_API_KEY"),
+                                          args.preprocess)
+        finally:
+            if tesseract is not None:
+                tesseract.close()
+        print(text)
+        print(latex)
+        raise SystemExit(0)
+    
     # Check if required packages are installed
     try:
         import pytesseract
@@ -713,5 +717,9 @@ if __name__ == "__main__":
         exit(1)
     
     # Create and run the OCR tool
-    app = ModernScreenOCR()
+    # OCR_OVERLAY_STATS=1 prints selection overlay frame times after each capture
+    app = ModernScreenOCR(ocr_backend=ocr_backend, ocr_pool_size=ocr_pool_size,
+                          tesseract_cmd=pytesseract.pytesseract.tesseract_cmd,
+                          report_overlay_stats=os.environ.get("OCR_OVERLAY_STATS", "") not in ("", "0"),
+                          preprocess=args.preprocess)
     app.run()
\ No newline at end of file
@@ -0,0 +1,143 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from termo_instrument import instrumented, register_cache
+from termo_table import PROPERTIES, ThermoTable
+
+Reaction = Tuple[Dict[str, float], Dict[str, float]]
+
+
+class StoichiometryMatrix:
+    """
+    Signed sparse (CSR) stoichiometry matrix, reactions x table substances.
+
+    Products get positive coefficients and reactants negative ones, so
+    `S @ P` with P the (substances x properties) table gives
+    Σ(products) - Σ(reactants) for every reaction and property at once.
+    """
+
+    __slots__ = ("indptr", "indices", "data", "shape")
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, shape: Tuple[int, int]):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    def __matmul__(self, dense: np.ndarray) -> np.ndarray:
+        dense = np.asarray(dense, dtype=np.float64)
+        out = np.zeros((self.shape[0],) + dense.shape[1:], dtype=np.float64)
+        if self.data.size == 0:
+            return out
+
+        terms = self.data.reshape((-1,) + (1,) * (dense.ndim - 1)) * dense[self.indices]
+        # reduceat chokes on empty rows (unknown-substance reactions), so skip them
+        starts = self.indptr[:-1]
+        nonempty = starts < self.indptr[1:]
+        out[nonempty] = np.add.reduceat(terms, starts[nonempty], axis=0)
+        return out
+
+    def toarray(self) -> np.ndarray:
+        dense = np.zeros(self.shape, dtype=np.float64)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        np.add.at(dense, (rows, self.indices), self.data)
+        return dense
+
+
+class BatchResult(NamedTuple):
+    """
+    values : np.ndarray
+        (reactions x 3) array of ΔH°, ΔG°, ΔS° (columns "H", "G", "E"),
+        NaN for reactions with unknown substances or missing table values
+    unknown : List[Tuple[str, ...]]
+        Unknown substances per reaction, empty tuple if all were found
+    """
+    values: np.ndarray
+    unknown: List[Tuple[str, ...]]
+
+    def column(self, property_name: str) -> np.ndarray:
+        if property_name not in PROPERTIES:
+            raise ValueError(f"Invalid property '{property_name}'. Must be one of {set(PROPERTIES)}")
+        return self.values[:, PROPERTIES.index(property_name)]
+
+    @property
+    def ok(self) -> np.ndarray:
+        return np.array([not u for u in self.unknown], dtype=bool)
+
+
+@lru_cache(maxsize=8)
+def property_matrix(table: ThermoTable) -> np.ndarray:
+    "(substances x 3) float64 matrix of the H, G, E columns."
+    return np.column_stack([np.asarray(table.column(prop)) for prop in PROPERTIES])
+
+
+register_cache("batch.property_matrix", property_matrix)
+
+
+@instrumented("batch.compile_reactions")
+def compile_reactions(table: ThermoTable,
+                      reactions: Iterable[Reaction]) -> Tuple[StoichiometryMatrix, List[Tuple[str, ...]]]:
+    """
+    Compile (reactants, products) dicts into a signed stoichiometry matrix.
+
+    Reactions with unknown substances get an empty row and are reported in
+    the returned list instead of raising.
+    """
+    index = table._index
+    indptr = [0]
+    indices = []
+    data = []
+    unknown = []
+
+    for reactants, products in reactions:
+        row = {}
+        missing = []
+        for sign, side in ((-1.0, reactants), (1.0, products)):
+            for substance, coeff in side.items():
+                col = index.get(substance)
+                if col is None:
+                    missing.append(substance)
+                else:
+                    row[col] = row.get(col, 0.0) + sign * coeff
+
+        if missing:
+            unknown.append(tuple(missing))
+        else:
+            unknown.append(())
+            indices.extend(row.keys())
+            data.extend(row.values())
+        indptr.append(len(indices))
+
+    matrix = StoichiometryMatrix(np.array(indptr, dtype=np.int64),
+                                 np.array(indices, dtype=np.int64),
+                                 np.array(data, dtype=np.float64),
+                                 (len(unknown), len(table)))
+    return matrix, unknown
+
+
+@instrumented("batch.calculate_reactions_batch")
+def calculate_reactions_batch(table: ThermoTable, reactions: Iterable[Reaction]) -> BatchResult:
+    """
+    Calculate ΔH°, ΔG° and ΔS° for many reactions in one sparse product.
+
+    Batch version of `calculate_reaction`: same Σ(products) - Σ(reactants)
+    and same 3-decimal rounding, but unknown substances are reported per
+    reaction (row of NaN) instead of aborting the whole batch.
+
+    Parameters
+    ----------
+    table : ThermoTable
+        Appendix 2 table (a DataFrame is converted on the fly)
+    reactions : Iterable[Tuple[Dict, Dict]]
+        (reactants, products) pairs, same dicts as `calculate_reaction`
+    """
+    if not isinstance(table, ThermoTable):
+        table = ThermoTable.from_dataframe(table)
+
+    matrix, unknown = compile_reactions(table, reactions)
+    values = np.round(matrix @ property_matrix(table), 3)
+    bad = np.array([bool(u) for u in unknown], dtype=bool)
+    values[bad] = np.nan
+    return BatchResult(values, unknown)
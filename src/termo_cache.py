@@ -0,0 +1,133 @@
+"""
+Binary columnar cache for the Appendix 2 CSV.
+
+The CSV is converted once into a small binary file keyed by the CSV's
+content hash and memory-mapped on later runs, so worker processes share
+the same pages and nobody has to import pandas just to read 140 rows.
+A changed CSV has a different hash and the cache is rebuilt.
+
+File layout (little endian):
+    header   magic b"TTAB", version u32, n_rows u32, blob_len u32
+    columns  H, G, E as n_rows float64 each
+    offsets  (n_rows + 1) u32 into the string blob
+    blob     utf-8 substance names
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Optional
+
+from termo_instrument import count, instrumented
+from termo_table import PROPERTIES, ThermoTable
+
+MAGIC = b"TTAB"
+VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+
+
+def cache_path(csv_path: str, cache_dir: Optional[str] = None) -> str:
+    "Where the cache for the current contents of `csv_path` lives."
+    with open(csv_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), ".cache")
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{digest}.ttab")
+
+
+def write_cache(table: ThermoTable, path: str) -> None:
+    "Write `table` to `path` atomically (temp file + rename)."
+    names = [s.encode("utf-8") for s in table.substances]
+    offsets = array("I", [0])
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+    blob = b"".join(names)
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(table), len(blob)))
+            for prop in PROPERTIES:
+                f.write(table.column(prop).tobytes())
+            f.write(offsets.tobytes())
+            f.write(blob)
+        os.chmod(tmp, 0o644)  # mkstemp makes it 0600, other workers need to read it
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_cache(path: str) -> ThermoTable:
+    """
+    Memory-map a cache file. The float columns point straight into the
+    mapping, only the substance names are decoded.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, n, blob_len = _HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a ThermoTable cache (or wrong version): {path}")
+
+    view = memoryview(mm)
+    pos = _HEADER.size
+    columns = {}
+    for prop in PROPERTIES:
+        columns[prop] = view[pos:pos + 8 * n].cast("d")
+        pos += 8 * n
+    offsets = view[pos:pos + 4 * (n + 1)].cast("I")
+    pos += 4 * (n + 1)
+    blob = bytes(view[pos:pos + blob_len])
+    substances = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(n)]
+    return ThermoTable(substances, columns)
+
+
+@instrumented("cache.load_table")
+def load_table(csv_path: str = "data/Appendix2.csv", cache_dir: Optional[str] = None) -> ThermoTable:
+    """
+    Load the Appendix 2 table, going through the binary cache.
+
+    The first call (or the first after the CSV changed) parses the CSV and
+    writes the cache, stale caches for the same CSV are removed. If the
+    cache can't be written (read-only checkout etc.) the parsed table is
+    returned anyway.
+    """
+    if sys.byteorder != "little":
+        return ThermoTable.from_csv(csv_path)
+
+    path = cache_path(csv_path, cache_dir)
+    if os.path.exists(path):
+        try:
+            table = read_cache(path)
+            count("cache.table_file", hit=True)
+            return table
+        except (OSError, ValueError, TypeError, struct.error):
+            pass  # corrupt or old format, rebuild below
+    count("cache.table_file", hit=False)
+
+    table = ThermoTable.from_csv(csv_path)
+    try:
+        write_cache(table, path)
+        _remove_stale(path)
+    except OSError:
+        return table
+    return read_cache(path)
+
+
+def _remove_stale(current: str) -> None:
+    directory = os.path.dirname(current)
+    prefix = os.path.basename(current).rsplit("-", 1)[0] + "-"
+    for name in os.listdir(directory):
+        full = os.path.join(directory, name)
+        if name.startswith(prefix) and name.endswith(".ttab") and full != current:
+            try:
+                os.unlink(full)
+            except OSError:
+                pass
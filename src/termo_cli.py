@@ -0,0 +1,223 @@
+"""
+Batch thermochemistry from the command line.
+
+Reads reactions from files (or stdin, "-"), one per line, either as JSON
+    {"id": "q16", "reactants": {"SO2(g)": 2, "O2(g)": 1}, "products": {"SO3(g)": 2}}
+or as text
+    2 SO2(g) + O2(g) -> 2 SO3(g)
+and streams ΔH°, ΔG°, ΔS° (and K(T) for every -T) out as CSV or JSONL.
+Reactions are evaluated with the batch engine in fixed-size chunks, so memory
+stays constant no matter how big the input is.
+
+    python src/termo_cli.py reactions.txt -T 298.15 -T 1073.15 --format jsonl
+"""
+import argparse
+import csv
+import json
+import math
+import re
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from termo_cache import load_table
+from termo_table import ThermoTable
+
+DEFAULT_CHUNK_SIZE = 4096
+
+_ARROW = re.compile(r"\s*(?:->|→|=>|⇌|<=>|=)\s*")
+# Species are separated by " + " with whitespace around it, "Na+(aq)" keeps its charge
+_PLUS = re.compile(r"\s+\+\s+")
+_TERM = re.compile(r"^(\d+(?:\.\d+)?(?:/\d+)?)?\s*(\S+)$")
+
+
+class ParsedReaction(NamedTuple):
+    id: str
+    text: str
+    reactants: Dict[str, float]
+    products: Dict[str, float]
+    error: Optional[str]
+
+
+def _coefficient(raw: Optional[str]) -> float:
+    if not raw:
+        return 1.0
+    if "/" in raw:
+        num, den = raw.split("/")
+        return float(num) / float(den)
+    return float(raw)
+
+
+def _parse_side(side: str) -> Dict[str, float]:
+    species = {}
+    side = side.strip()
+    if not side:
+        return species
+    for term in _PLUS.split(side):
+        m = _TERM.match(term.strip())
+        if m is None:
+            raise ValueError(f"Could not parse term '{term}'")
+        coeff, formula = m.groups()
+        species[formula] = species.get(formula, 0.0) + _coefficient(coeff)
+    return species
+
+
+def parse_reaction_text(text: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+    "Parse '2 SO2(g) + O2(g) -> 2 SO3(g)' into (reactants, products)."
+    sides = _ARROW.split(text.strip())
+    if len(sides) != 2:
+        raise ValueError(f"Expected exactly one arrow in '{text.strip()}'")
+    return _parse_side(sides[0]), _parse_side(sides[1])
+
+
+def format_reaction(reactants: Dict, products: Dict) -> str:
+    def side(species):
+        return " + ".join(f"{c:g} {s}" if c != 1 else s for s, c in species.items())
+    return f"{side(reactants)} -> {side(products)}"
+
+
+def read_reactions(stream: TextIO, source: str = "-") -> Iterator[ParsedReaction]:
+    """
+    Lazily parse reactions from a text stream. Blank lines and '#' comments
+    are skipped, lines that don't parse are yielded with `error` set.
+    """
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        rid = f"{source}:{lineno}"
+        try:
+            if line.startswith("{"):
+                obj = json.loads(line)
+                rid = str(obj.get("id", rid))
+                reactants = {k: float(v) for k, v in obj["reactants"].items()}
+                products = {k: float(v) for k, v in obj["products"].items()}
+                text = format_reaction(reactants, products)
+            else:
+                reactants, products = parse_reaction_text(line)
+                text = line
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            yield ParsedReaction(rid, line, {}, {}, f"parse error: {e}")
+            continue
+        yield ParsedReaction(rid, text, reactants, products, None)
+
+
+def evaluate_stream(table: ThermoTable, reactions: Iterable[ParsedReaction],
+                    temperatures: List[float] = (),
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Evaluate parsed reactions chunk by chunk and yield one result row each.
+
+    K(T) uses ΔG°(T) = ΔH° - TΔS° from the tabulated ΔH° and ΔS°.
+    """
+    import numpy as np
+    from termo_batch import calculate_reactions_batch
+    from termo_numeric import k_from_delta_g
+
+    T = np.asarray(temperatures, dtype=np.float64)
+    reactions = iter(reactions)
+    while True:
+        chunk = list(islice(reactions, chunk_size))
+        if not chunk:
+            return
+
+        batch = calculate_reactions_batch(table, [(r.reactants, r.products) for r in chunk])
+        K = None
+        if T.size:
+            G = batch.column("H")[:, None] - T * batch.column("E")[:, None] / 1000.0
+            with np.errstate(over="ignore"):
+                K = k_from_delta_g(G * 1000.0, T)
+
+        # One tolist() per chunk instead of a NumPy scalar per cell
+        values = batch.values.tolist()
+        K = K.tolist() if K is not None else None
+        for i, r in enumerate(chunk):
+            row = {"id": r.id, "reaction": r.text}
+            for j, name in enumerate(("dH", "dG", "dS")):  # table order H, G, E
+                row[name] = None if r.error else _clean(values[i][j])
+            for j, temperature in enumerate(temperatures):
+                row[f"K({temperature:g})"] = None if r.error else _clean(K[i][j])
+            if r.error:
+                row["error"] = r.error
+            elif batch.unknown[i]:
+                row["error"] = "unknown substance: " + ", ".join(batch.unknown[i])
+            else:
+                row["error"] = _missing_values(row)
+            yield row
+
+
+def _clean(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _json_value(value):
+    return None if isinstance(value, float) and not math.isfinite(value) else value
+
+
+def _missing_values(row: dict) -> Optional[str]:
+    missing = [k for k in ("dH", "dG", "dS") if row[k] is None]
+    return f"missing table values for {', '.join(missing)}" if missing else None
+
+
+def write_rows(rows: Iterable[dict], out: TextIO, fmt: str, temperatures: List[float] = ()) -> int:
+    """
+    Stream rows as CSV or JSONL, returns the number of rows written.
+
+    JSON has no inf/NaN, so non-finite values (e.g. an overflowing K) are
+    written as null in JSONL; CSV keeps them as "inf".
+    """
+    n = 0
+    if fmt == "jsonl":
+        for row in rows:
+            row = {k: _json_value(v) for k, v in row.items()}
+            out.write(json.dumps(row, ensure_ascii=False, allow_nan=False) + "\n")
+            n += 1
+        return n
+
+    fields = ["id", "reaction", "dH", "dG", "dS"] + [f"K({T:g})" for T in temperatures] + ["error"]
+    writer = csv.DictWriter(out, fieldnames=fields, lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({k: ("" if v is None else v) for k, v in row.items()})
+        n += 1
+    return n
+
+
+def _inputs(paths: List[str]) -> Iterator[ParsedReaction]:
+    for path in paths:
+        if path == "-":
+            yield from read_reactions(sys.stdin, "-")
+        else:
+            with open(path, encoding="utf-8") as f:
+                yield from read_reactions(f, path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="*", default=["-"], help="reaction files, '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("-f", "--format", choices=("csv", "jsonl"), default="csv")
+    parser.add_argument("-T", "--temperature", type=float, action="append", default=[],
+                        help="also compute K at this temperature in K (repeatable)")
+    parser.add_argument("--table", default="data/Appendix2.csv", help="Appendix 2 CSV")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    table = load_table(args.table)
+    rows = evaluate_stream(table, _inputs(args.inputs), args.temperature, args.chunk_size)
+
+    if args.output == "-":
+        try:
+            write_rows(rows, sys.stdout, args.format, args.temperature)
+        except BrokenPipeError:
+            # Downstream closed the pipe (e.g. `| head`), not an error for us
+            sys.stdout = None
+            return 0
+    else:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            write_rows(rows, out, args.format, args.temperature)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
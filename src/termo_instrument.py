@@ -0,0 +1,297 @@
+"""
+Opt-in instrumentation for the thermochemistry hot paths.
+
+Modules mark their stages with `@instrumented("stage")` and their
+lru_caches with `register_cache`. While profiling is off the originals are
+what every module has bound, so there is no overhead at all. `enable()`
+swaps a timing wrapper into the globals of the defining modules (including
+scripts loaded by path, like 4-termo.py) and of every loaded module from
+this directory, which may hold `from x import f` copies; `disable()` puts
+the originals back. Nothing else is touched: installed packages, and
+references stored before enabling (`f = termo.lookup_property`), keep
+calling the uninstrumented function.
+
+    with profile(trace=True) as prof:
+        for r, p in reactions:
+            calculate_reaction(apx2, r, p, "G")
+    print(prof.summary())
+    prof.write_trace("trace.json")  # chrome://tracing or ui.perfetto.dev
+
+Per stage you get calls, errors, cumulative and max time (inclusive, so
+calculate_reaction includes its lookup_property calls), plus hit/miss
+counts for the registered caches and for `count()` events like the table
+cache in termo_cache.
+"""
+import functools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+_originals: Dict[str, Callable] = {}  # stage -> original function
+_wrappers: Dict[str, Callable] = {}   # stage -> timing wrapper
+_caches: Dict[str, Callable] = {}     # name -> lru_cache'd function
+_active: Optional["Profiler"] = None
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class StageStats:
+    __slots__ = ("calls", "errors", "total", "max")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"calls": self.calls, "errors": self.errors, "total": self.total, "max": self.max}
+
+
+class Profiler:
+    """
+    Collected measurements of one enable()/disable() session.
+
+    Parameters
+    ----------
+    trace : bool
+        Also record every call as a Chrome trace event
+    max_events : int
+        Stop recording trace events after this many (stats keep counting)
+    """
+
+    def __init__(self, trace: bool = False, max_events: int = 1_000_000):
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, list] = {}  # name -> [hits, misses]
+        self.trace = trace
+        self.max_events = max_events
+        self.events = []
+        self.dropped_events = 0
+        self.start = time.perf_counter()
+        self.end = None
+        self._cache_start = {name: fn.cache_info() for name, fn in _caches.items()}
+        self._cache_end = None
+        self._stop_reporter = None
+        # Guards inserts into stages/counters against the summary_every
+        # reporter thread iterating them; updates to existing entries don't
+        # need it, so the per-call path stays lock-free
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, t0: float, t1: float, error: bool) -> None:
+        stats = self.stages.get(stage)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(stage, StageStats())
+        elapsed = t1 - t0
+        stats.calls += 1
+        stats.total += elapsed
+        if elapsed > stats.max:
+            stats.max = elapsed
+        if error:
+            stats.errors += 1
+        if self.trace:
+            if len(self.events) < self.max_events:
+                self.events.append((stage, t0, elapsed))
+            else:
+                self.dropped_events += 1
+
+    def count(self, name: str, hit: bool) -> None:
+        counter = self.counters.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(name, [0, 0])
+        counter[0 if hit else 1] += 1
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        "Hits/misses per registered cache and counter during the session."
+        stats = {}
+        with self._lock:
+            counters = list(self.counters.items())
+        for name, fn in list(_caches.items()):
+            now = self._cache_end.get(name) if self._cache_end else fn.cache_info()
+            before = self._cache_start.get(name)
+            if now is None:
+                continue
+            hits = now.hits - (before.hits if before else 0)
+            misses = now.misses - (before.misses if before else 0)
+            stats[name] = {"hits": hits, "misses": misses}
+        for name, (hits, misses) in counters:
+            stats[name] = {"hits": hits, "misses": misses}
+        return stats
+
+    def _stages(self):
+        with self._lock:
+            return list(self.stages.items())
+
+    def as_dict(self) -> Dict[str, dict]:
+        return {"stages": {name: s.as_dict() for name, s in self._stages()},
+                "caches": self.cache_stats()}
+
+    def summary(self) -> str:
+        "Plain-text table, slowest stage first."
+        elapsed = (self.end or time.perf_counter()) - self.start
+        lines = [f"{'stage':36s} {'calls':>10s} {'errors':>7s} {'total ms':>10s} {'mean µs':>9s} {'max µs':>9s}"]
+        for name, s in sorted(self._stages(), key=lambda item: -item[1].total):
+            mean = s.total / s.calls if s.calls else 0.0
+            lines.append(f"{name:36s} {s.calls:10d} {s.errors:7d} {s.total * 1e3:10.3f} "
+                         f"{mean * 1e6:9.2f} {s.max * 1e6:9.2f}")
+        caches = self.cache_stats()
+        if caches:
+            lines.append(f"{'cache':36s} {'hits':>10s} {'misses':>7s} {'hit rate':>10s}")
+            for name, c in caches.items():
+                total = c["hits"] + c["misses"]
+                rate = f"{c['hits'] / total:.1%}" if total else "-"
+                lines.append(f"{name:36s} {c['hits']:10d} {c['misses']:7d} {rate:>10s}")
+        lines.append(f"wall time {elapsed * 1e3:.3f} ms")
+        if self.dropped_events:
+            lines.append(f"{self.dropped_events} trace events dropped (max_events={self.max_events})")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        "Trace Event Format dict (complete 'X' events, µs) for chrome://tracing / Perfetto."
+        events = [{"name": stage, "cat": stage.split(".", 1)[0], "ph": "X",
+                   "ts": (t0 - self.start) * 1e6, "dur": dur * 1e6, "pid": 1, "tid": 1}
+                  for stage, t0, dur in self.events]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: str) -> None:
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def _report_every(self, interval: float, stream) -> None:
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                print(self.summary(), file=stream, flush=True)
+
+        threading.Thread(target=run, name="termo-instrument", daemon=True).start()
+        self._stop_reporter = stop
+
+
+def _wrap(stage: str, fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        prof = _active
+        if prof is None:  # a reference that outlived the session
+            return fn(*args, **kwargs)
+        error = True
+        t0 = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            prof.record(stage, t0, time.perf_counter(), error)
+    return wrapper
+
+
+def _own_modules():
+    "Loaded modules that live in this directory, i.e. that can import instrumented functions."
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == _HERE:
+            yield module
+
+
+def _namespaces():
+    "Globals of this directory's loaded modules plus the defining globals of each stage."
+    seen = {}
+    for module in _own_modules():
+        seen[id(module.__dict__)] = module.__dict__
+    for fn in _originals.values():
+        namespace = getattr(getattr(fn, "__wrapped__", fn), "__globals__", None)
+        if namespace is not None:
+            seen[id(namespace)] = namespace
+    return seen.values()
+
+
+def _swap(mapping: Dict[int, tuple]) -> None:
+    "Rebind module globals: mapping is id(old) -> (old, new)."
+    for namespace in _namespaces():
+        for name, value in list(namespace.items()):
+            entry = mapping.get(id(value))
+            if entry is not None and entry[0] is value:
+                namespace[name] = entry[1]
+
+
+def instrumented(stage: str) -> Callable[[Callable], Callable]:
+    "Decorator marking a function as a profiling stage; returns it unchanged while profiling is off."
+    def decorator(fn: Callable) -> Callable:
+        _originals[stage] = fn
+        _wrappers[stage] = _wrap(stage, fn)
+        return _wrappers[stage] if _active is not None else fn
+    return decorator
+
+
+def register_cache(name: str, fn: Callable) -> None:
+    "Report hits/misses of an lru_cache'd function in the summaries."
+    _caches[name] = fn
+    if _active is not None:
+        _active._cache_start.setdefault(name, fn.cache_info())
+
+
+def count(name: str, hit: bool) -> None:
+    "Hit/miss event for caches that aren't lru_caches. No-op while profiling is off."
+    if _active is not None:
+        _active.count(name, hit)
+
+
+def is_enabled() -> bool:
+    return _active is not None
+
+
+def enable(trace: bool = False, summary_every: Optional[float] = None, stream=None,
+           max_events: int = 1_000_000) -> Profiler:
+    """
+    Start a profiling session and return its Profiler.
+
+    Parameters
+    ----------
+    trace : bool
+        Record a Chrome-trace timeline as well
+    summary_every : float, optional
+        Print `summary()` every this many seconds (to `stream`, stderr by default)
+    """
+    global _active
+    if _active is not None:
+        disable()
+    _active = Profiler(trace=trace, max_events=max_events)
+    try:
+        _swap({id(fn): (fn, _wrappers[stage]) for stage, fn in _originals.items()})
+        if summary_every:
+            _active._report_every(summary_every, stream or sys.stderr)
+    except BaseException:
+        disable()  # swaps back whatever got swapped
+        raise
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    "End the session, restore the originals and return the finished Profiler. Safe to call twice."
+    global _active
+    prof = _active
+    if prof is None:
+        return None
+    _swap({id(w): (w, _originals[stage]) for stage, w in _wrappers.items()})
+    _active = None
+    prof.end = time.perf_counter()
+    prof._cache_end = {name: fn.cache_info() for name, fn in _caches.items()}
+    if prof._stop_reporter is not None:
+        prof._stop_reporter.set()
+    return prof
+
+
+@contextmanager
+def profile(trace: bool = False, summary_every: Optional[float] = None, stream=None,
+            max_events: int = 1_000_000):
+    "Profile a block of calculations; yields the Profiler, which stays readable afterwards."
+    prof = enable(trace=trace, summary_every=summary_every, stream=stream, max_events=max_events)
+    try:
+        yield prof
+    finally:
+        disable()
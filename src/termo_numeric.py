@@ -0,0 +1,96 @@
+"""
+Closed-form ΔG° <-> K and crossover temperature solvers.
+
+Replaces the per-call SymPy `solve` in 4-termo.py. Every function takes
+scalars or NumPy arrays (broadcast like a ufunc); plain Python scalars stay
+on the `math` fast path and come back as float. Both paths give the same
+out-of-range results without raising or warning: inf when exp overflows,
+ΔG° = +inf for K = 0, NaN for K < 0.
+
+Units follow the Question blocks: ΔG and ΔH in J/mol, S in J/(mol·K),
+T in K, R = 8.314 J/(mol·K).
+"""
+import math
+
+from termo_instrument import instrumented
+
+R = 8.314  # J/(mol·K)
+
+
+def _scalar(*args) -> bool:
+    return all(isinstance(a, (int, float)) for a in args)
+
+
+def _exp(x: float) -> float:
+    # np.exp gives inf on overflow, math.exp raises
+    try:
+        return math.exp(x)
+    except OverflowError:
+        return math.inf
+
+
+def _log(x: float) -> float:
+    # np.log gives -inf for 0 and NaN below, math.log raises
+    if x > 0:
+        return math.log(x)
+    return -math.inf if x == 0 else math.nan
+
+
+@instrumented("numeric.delta_g_from_k")
+def delta_g_from_k(K, T, R: float = R):
+    """ΔG° = -RT ln(K)"""
+    if _scalar(K, T, R):
+        return -R * T * _log(K)
+    import numpy as np
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return -R * np.asarray(T, dtype=float) * np.log(np.asarray(K, dtype=float))
+
+
+@instrumented("numeric.k_from_delta_g")
+def k_from_delta_g(G, T, R: float = R):
+    """K = exp(-ΔG° / RT)"""
+    if _scalar(G, T, R):
+        return _exp(-G / (R * T))
+    import numpy as np
+    with np.errstate(over="ignore"):
+        return np.exp(-np.asarray(G, dtype=float) / (R * np.asarray(T, dtype=float)))
+
+
+@instrumented("numeric.crossover_temperature")
+def crossover_temperature(H, S):
+    """
+    Temperature where ΔG = ΔH - TΔS changes sign, T = ΔH/ΔS.
+
+    NaN where ΔS = 0 (no crossover). H and S have to be in matching units,
+    e.g. J/mol and J/(mol·K).
+    """
+    if _scalar(H, S):
+        return H / S if S != 0 else math.nan
+    import numpy as np
+    H = np.asarray(H, dtype=float)
+    S = np.asarray(S, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(S != 0, H / np.where(S != 0, S, 1.0), np.nan)
+
+
+@instrumented("numeric.k_at_temperature")
+def k_at_temperature(K1, T1, T2, H, R: float = R):
+    """
+    van 't Hoff: ln(K2/K1) = -ΔH°/R (1/T2 - 1/T1), assuming ΔH° constant.
+
+    Parameters
+    ----------
+    K1 : float or array
+        Equilibrium constant at T1
+    T1, T2 : float or array
+        Known and target temperature in K
+    H : float or array
+        ΔH° in J/mol
+    """
+    if _scalar(K1, T1, T2, H, R):
+        return K1 * _exp(-H / R * (1.0 / T2 - 1.0 / T1))
+    import numpy as np
+    T1 = np.asarray(T1, dtype=float)
+    T2 = np.asarray(T2, dtype=float)
+    with np.errstate(over="ignore", invalid="ignore"):
+        return np.asarray(K1, dtype=float) * np.exp(-np.asarray(H, dtype=float) / R * (1.0 / T2 - 1.0 / T1))
@@ -0,0 +1,122 @@
+"""
+Process-pool execution for large reaction screens.
+
+The input reaction stream is cut into chunks and sharded over worker
+processes, each chunk evaluated with `calculate_reactions_batch`. Only a
+few chunks per worker are in flight at a time, so arbitrarily long
+streams run in bounded memory. The H/G/E
+columns live in one shared-memory block that the workers map read-only, so
+no DataFrame (or table) is pickled per task; only the substance names are
+sent once per worker. Results come back in input order.
+"""
+import os
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from termo_batch import BatchResult, Reaction, calculate_reactions_batch
+from termo_table import PROPERTIES, ThermoTable
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Set in each worker by _init_worker
+_worker_table: Optional[ThermoTable] = None
+_worker_shm: Optional[SharedMemory] = None
+
+
+def _init_worker(shm_name: str, substances: Tuple[str, ...]) -> None:
+    global _worker_table, _worker_shm
+    _worker_shm = SharedMemory(name=shm_name)
+    n = len(substances)
+    view = _worker_shm.buf.toreadonly()
+    columns = {prop: view[8 * n * k:8 * n * (k + 1)].cast("d") for k, prop in enumerate(PROPERTIES)}
+    _worker_table = ThermoTable(substances, columns)
+
+
+def _evaluate_chunk(chunk: List[Reaction]) -> BatchResult:
+    return calculate_reactions_batch(_worker_table, chunk)
+
+
+def _chunks(reactions: Iterable[Reaction], size: int) -> Iterator[List[Reaction]]:
+    reactions = iter(reactions)
+    while True:
+        chunk = list(islice(reactions, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _share(table: ThermoTable) -> SharedMemory:
+    n = len(table)
+    shm = SharedMemory(create=True, size=max(8 * n * len(PROPERTIES), 1))
+    for k, prop in enumerate(PROPERTIES):
+        shm.buf[8 * n * k:8 * n * (k + 1)] = table.column(prop).cast("B")
+    return shm
+
+
+def iter_reactions_parallel(table: ThermoTable, reactions: Iterable[Reaction],
+                            workers: Optional[int] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            in_flight: Optional[int] = None) -> Iterator[BatchResult]:
+    """
+    Evaluate a reaction stream on a process pool, yielding one BatchResult
+    per chunk of `chunk_size` reactions, in input order.
+
+    Parameters
+    ----------
+    table : ThermoTable
+        Appendix 2 table, shared with the workers through shared memory
+    reactions : Iterable[Tuple[Dict, Dict]]
+        (reactants, products) pairs, read a chunk at a time: at most
+        `in_flight` chunks are submitted but not yet yielded
+    workers : int, optional
+        Number of processes, defaults to os.cpu_count()
+    in_flight : int, optional
+        Chunks queued at once, defaults to 2 * workers (enough to keep
+        every worker busy while the consumer takes results)
+    """
+    if not isinstance(table, ThermoTable):
+        table = ThermoTable.from_dataframe(table)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        # No point paying for processes
+        for chunk in _chunks(reactions, chunk_size):
+            yield calculate_reactions_batch(table, chunk)
+        return
+
+    shm = _share(table)
+    try:
+        with Pool(workers, initializer=_init_worker, initargs=(shm.name, table.substances)) as pool:
+            # Not pool.imap: its task thread drains the whole input up front.
+            # A bounded window of async results, yielded from the head,
+            # keeps the order and caps memory
+            pending = deque()
+            limit = in_flight or 2 * workers
+            for chunk in _chunks(reactions, chunk_size):
+                if len(pending) >= limit:
+                    yield pending.popleft().get()
+                pending.append(pool.apply_async(_evaluate_chunk, (chunk,)))
+            while pending:
+                yield pending.popleft().get()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def calculate_reactions_parallel(table: ThermoTable, reactions: Iterable[Reaction],
+                                 workers: Optional[int] = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchResult:
+    "Like `calculate_reactions_batch` but sharded over `workers` processes."
+    values = []
+    unknown = []
+    for result in iter_reactions_parallel(table, reactions, workers, chunk_size):
+        values.append(result.values)
+        unknown.extend(result.unknown)
+    if not values:
+        return BatchResult(np.empty((0, len(PROPERTIES))), [])
+    return BatchResult(np.concatenate(values), unknown)
@@ -0,0 +1,84 @@
+import math
+from typing import Dict, Tuple
+
+from termo_table import PROPERTIES, ThermoTable, round3
+
+
+class Reaction:
+    """
+    A reaction compiled against a ThermoTable.
+
+    Substance names are resolved to row indices and signed coefficients
+    (products +, reactants -) once, and their ΔH°, ΔG° and ΔS° gathered into
+    one contiguous row-major (k x 3) block, so all three properties come
+    out of a single pass over it. Results are memoized since the table is
+    immutable, which makes repeated evaluation in sweeps ~free.
+
+    Use `Reaction.compile(table, reactants, products)`, not the constructor.
+    """
+
+    __slots__ = ("table", "reactants", "products", "rows", "coeffs", "_values", "_results")
+
+    def __init__(self, table: ThermoTable, reactants: Dict, products: Dict,
+                 rows: Tuple[int, ...], coeffs: Tuple[float, ...]):
+        self.table = table
+        self.reactants = dict(reactants)
+        self.products = dict(products)
+        self.rows = rows
+        self.coeffs = coeffs
+        # Gather the property values once so evaluation never touches the table:
+        # (H, G, E) of rows[0], then of rows[1], ...
+        columns = [table.column(prop) for prop in PROPERTIES]
+        self._values = tuple(column[i] for i in rows for column in columns)
+        self._results = {}
+
+    @classmethod
+    def compile(cls, table: ThermoTable, reactants: Dict, products: Dict) -> "Reaction":
+        """
+        Resolve a reaction once. Raises KeyError for unknown substances,
+        same as `calculate_reaction`.
+        """
+        if not isinstance(table, ThermoTable):
+            table = ThermoTable.from_dataframe(table)
+
+        signed = {}
+        for sign, side in ((-1.0, reactants), (1.0, products)):
+            for substance, coeff in side.items():
+                row = table.index(substance)
+                signed[row] = signed.get(row, 0.0) + sign * coeff
+        return cls(table, reactants, products, tuple(signed), tuple(signed.values()))
+
+    def evaluate(self, property_name: str) -> float:
+        """
+        ΔH°rxn, ΔG°rxn or ΔS°rxn ("H", "G", "E") rounded like `calculate_reaction`.
+        """
+        try:
+            value = (self._results or self._compute())[property_name]
+        except KeyError:
+            raise ValueError(f"Invalid property '{property_name}'. Must be one of {set(PROPERTIES)}") from None
+        if math.isnan(value):
+            missing = [s for s in (*self.reactants, *self.products)
+                       if math.isnan(self.table.column(property_name)[self.table.index(s)])]
+            raise ValueError(f"No '{property_name}' value for {missing} in the table.")
+        return value
+
+    def evaluate_all(self) -> Dict[str, float]:
+        "All three properties at once: {'H': ΔH°, 'G': ΔG°, 'E': ΔS°}."
+        return {prop: self.evaluate(prop) for prop in PROPERTIES}
+
+    def _compute(self) -> Dict[str, float]:
+        # coeffs · block in one pass; NaN results are kept so evaluate() can
+        # name the missing substances
+        h = g = e = 0.0
+        values = iter(self._values)
+        for c, vh, vg, ve in zip(self.coeffs, values, values, values):
+            h += c * vh
+            g += c * vg
+            e += c * ve
+        self._results = dict(zip(PROPERTIES, (round3(h), round3(g), round3(e))))
+        return self._results
+
+    def __repr__(self) -> str:
+        def side(species):
+            return " + ".join(f"{c:g} {s}" if c != 1 else s for s, c in species.items())
+        return f"Reaction({side(self.reactants)} -> {side(self.products)})"
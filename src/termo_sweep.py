@@ -0,0 +1,129 @@
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from termo_batch import Reaction, calculate_reactions_batch
+from termo_instrument import instrumented
+from termo_numeric import R, crossover_temperature
+from termo_table import ThermoTable
+
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+class SweepChunk(NamedTuple):
+    """
+    Rows [start, stop) and temperature columns [t_start, t_stop) of the
+    (reactions x temperatures) sweep. Chunks only split the temperature
+    axis when a single row doesn't fit in the budget.
+    """
+    start: int
+    stop: int
+    G: np.ndarray
+    K: np.ndarray
+    t_start: int = 0
+    t_stop: Optional[int] = None
+
+
+class SweepResult(NamedTuple):
+    """
+    G : np.ndarray
+        (reactions x temperatures) ΔG°(T) = ΔH° - TΔS° in kJ/mol
+    K : np.ndarray
+        (reactions x temperatures) K(T) = exp(-ΔG°/RT), inf where it overflows
+    crossover : np.ndarray
+        Temperature (K) where ΔG° changes sign, NaN if ΔS° = 0
+    unknown : List[Tuple[str, ...]]
+        Unknown substances per reaction (those rows are NaN)
+    """
+    G: np.ndarray
+    K: np.ndarray
+    crossover: np.ndarray
+    unknown: List[Tuple[str, ...]]
+
+
+def _chunk_shape(n_temperatures: int, max_bytes: int) -> Tuple[int, int]:
+    # G, K and one temporary of float64 per cell; whole rows when at least
+    # one fits, otherwise one row split along T
+    cells = max(1, max_bytes // (3 * 8))
+    n_temperatures = max(n_temperatures, 1)
+    if cells >= n_temperatures:
+        return cells // n_temperatures, n_temperatures
+    return 1, cells
+
+
+def iter_sweep(H: np.ndarray, S: np.ndarray, T, max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[SweepChunk]:
+    """
+    Gibbs–Helmholtz sweep from precomputed ΔH°/ΔS° vectors, in chunks.
+
+    Each chunk covers as many reactions as fit in `max_bytes`, so the peak
+    memory doesn't depend on the number of reactions; if even one reaction's
+    row doesn't fit, rows are split along the temperature axis too.
+
+    Parameters
+    ----------
+    H : np.ndarray
+        ΔH° per reaction in kJ/mol
+    S : np.ndarray
+        ΔS° per reaction in J/(mol·K)
+    T : array-like
+        Temperature grid in K
+    """
+    H = np.asarray(H, dtype=np.float64)
+    S = np.asarray(S, dtype=np.float64)
+    T = np.asarray(T, dtype=np.float64).ravel()
+    step, t_step = _chunk_shape(T.size, max_bytes)
+    minus_inv_RT = -1000.0 / (R * T)
+
+    for start in range(0, H.size, step):
+        stop = min(start + step, H.size)
+        for t_start in range(0, T.size, t_step):
+            t_stop = min(t_start + t_step, T.size)
+            # ΔG = ΔH - TΔS/1000, in kJ/mol
+            G = np.multiply.outer(S[start:stop], T[t_start:t_stop])
+            G *= -1e-3
+            G += H[start:stop, None]
+            K = G * minus_inv_RT[t_start:t_stop]
+            with np.errstate(over="ignore"):
+                np.exp(K, out=K)
+            yield SweepChunk(start, stop, G, K, t_start, t_stop)
+
+
+@instrumented("sweep.sweep_temperatures")
+def sweep_temperatures(table: ThermoTable, reactions: Iterable[Reaction], T,
+                       max_bytes: int = DEFAULT_MAX_BYTES,
+                       out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> SweepResult:
+    """
+    ΔG°(T), K(T) and the crossover temperature for a whole reaction set.
+
+    ΔH° and ΔS° come from `calculate_reactions_batch`, the (reactions x T)
+    arrays are then filled chunk by chunk with broadcasting.
+
+    `max_bytes` only bounds the per-chunk temporaries: the returned G and
+    K are full (reactions x T) float64 arrays, 16 bytes per cell. For
+    results that don't fit in memory, pass `out` or use `iter_sweep`.
+
+    Parameters
+    ----------
+    out : (np.ndarray, np.ndarray), optional
+        Preallocated (reactions x T) float64 targets for G and K, e.g.
+        `np.lib.format.open_memmap` files; they are filled in place and
+        returned in the result
+    """
+    batch = calculate_reactions_batch(table, reactions)
+    H = batch.column("H")
+    S = batch.column("E")
+    T = np.asarray(T, dtype=np.float64).ravel()
+
+    if out is None:
+        G = np.empty((H.size, T.size))
+        K = np.empty((H.size, T.size))
+    else:
+        G, K = out
+        for name, target in (("G", G), ("K", K)):
+            if target.shape != (H.size, T.size):
+                raise ValueError(f"out {name} has shape {target.shape}, expected {(H.size, T.size)}")
+    for chunk in iter_sweep(H, S, T, max_bytes):
+        G[chunk.start:chunk.stop, chunk.t_start:chunk.t_stop] = chunk.G
+        K[chunk.start:chunk.stop, chunk.t_start:chunk.t_stop] = chunk.K
+
+    return SweepResult(G, K, crossover_temperature(H * 1000.0, S), batch.unknown)
@@ -0,0 +1,121 @@
+import csv
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, Sequence
+
+PROPERTIES = ("H", "G", "E")
+
+
+class ThermoTable:
+    """
+    Immutable, hash-indexed version of the Appendix 2 table.
+
+    The H, G and E columns are stored as contiguous float64 buffers and the
+    substance names map straight to a row index, so a lookup is a dict hit
+    plus an array read instead of two scans of a DataFrame. Missing values
+    ("?" in Appendix 2) are stored as NaN.
+
+    Parameters
+    ----------
+    substances : Sequence[str]
+        Chemical formulas in row order (e.g. "Na2SO4(s)", "Na+(aq)")
+    columns : Dict[str, Iterable[float]]
+        One column of values per property "H", "G" and "E". Float64
+        memoryviews are wrapped without copying.
+    """
+
+    __slots__ = ("substances", "_index", "_columns")
+
+    def __init__(self, substances: Sequence[str], columns: Dict[str, Iterable[float]]):
+        substances = tuple(substances)
+        index = {}
+        for row, substance in enumerate(substances):
+            # First row wins, same as df.loc[...].iloc[0]
+            index.setdefault(substance, row)
+
+        packed = {}
+        for prop in PROPERTIES:
+            values = columns[prop]
+            # float64 buffers (e.g. a mmap'ed cache) are used as-is, no copy
+            if not (isinstance(values, memoryview) and values.format == "d"):
+                values = array("d", values)
+            if len(values) != len(substances):
+                raise ValueError(f"Column '{prop}' has {len(values)} rows, expected {len(substances)}")
+            packed[prop] = memoryview(values).toreadonly()
+
+        object.__setattr__(self, "substances", substances)
+        object.__setattr__(self, "_index", index)
+        object.__setattr__(self, "_columns", packed)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ThermoTable is immutable")
+
+    @classmethod
+    def from_csv(cls, path: str) -> "ThermoTable":
+        """Build the table from a CSV with columns: 'Substance', 'H', 'G', 'E'."""
+        substances = []
+        columns = {prop: [] for prop in PROPERTIES}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                substances.append(row["Substance"])
+                for prop in PROPERTIES:
+                    columns[prop].append(_parse_value(row[prop]))
+        return cls(substances, columns)
+
+    @classmethod
+    def from_dataframe(cls, df) -> "ThermoTable":
+        """Build the table from a DataFrame with columns: 'Substance', 'H', 'G', 'E'."""
+        return cls(df["Substance"].tolist(),
+                   {prop: [_parse_value(v) for v in df[prop].tolist()] for prop in PROPERTIES})
+
+    def __len__(self) -> int:
+        return len(self.substances)
+
+    def __contains__(self, substance: str) -> bool:
+        return substance in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.substances)
+
+    def __repr__(self) -> str:
+        return f"ThermoTable({len(self)} substances)"
+
+    def index(self, substance: str) -> int:
+        """Row index of a substance. Raises KeyError if it isn't in the table."""
+        try:
+            return self._index[substance]
+        except KeyError:
+            raise KeyError(f"Substance '{substance}' not found in the table.") from None
+
+    def column(self, property_name: str) -> memoryview:
+        """Read-only float64 buffer for "H", "G" or "E" (works with np.asarray)."""
+        try:
+            return self._columns[property_name]
+        except KeyError:
+            raise ValueError(f"Invalid property '{property_name}'. Must be one of {set(PROPERTIES)}") from None
+
+    def lookup(self, substance: str, property_name: str) -> float:
+        """
+        Retrieve a thermodynamic property for a given substance.
+
+        Same checks and exceptions as `lookup_property`: ValueError for an
+        unknown property or a missing ("?") value, KeyError for an unknown
+        substance.
+        """
+        column = self.column(property_name)
+        value = column[self.index(substance)]
+        if math.isnan(value):
+            raise ValueError(f"No '{property_name}' value for substance '{substance}' in the table.")
+        return value
+
+
+def round3(value: float) -> float:
+    "Round to 3 decimals exactly like np.round(value, 3) (half to even on value * 1000)."
+    return round(value * 1000.0) / 1000.0 if math.isfinite(value) else value
+
+
+def _parse_value(value) -> float:
+    "Appendix 2 marks missing values with '?'."
+    if isinstance(value, str) and value.strip() in ("?", ""):
+        return math.nan
+    return float(value)
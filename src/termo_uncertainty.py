@@ -0,0 +1,253 @@
+"""
+Uncertainty propagation for reaction properties.
+
+Appendix 2 values are point estimates. Standard uncertainties (1σ, same
+units as the values) can be given per substance and property, e.g. as
+optional "uH", "uG", "uE" columns next to "H", "G", "E" in the CSV
+(ThermoTable ignores extra columns, so the same file still loads). Values
+are taken as independent.
+
+A reaction value is Σ ν_i X_i, so the linear propagation
+σ² = Σ ν_i² σ_i² is exact for the spread; Monte Carlo samples every
+substance from N(X_i, σ_i) instead and gives empirical percentiles. Both
+work on the signed stoichiometry matrix from termo_batch.
+"""
+import csv
+import math
+from statistics import NormalDist
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from termo_batch import Reaction, StoichiometryMatrix, compile_reactions, property_matrix
+from termo_instrument import instrumented
+from termo_numeric import R, k_from_delta_g
+from termo_table import PROPERTIES, ThermoTable, _parse_value
+
+UNCERTAINTY_COLUMNS = {"H": "uH", "G": "uG", "E": "uE"}
+DEFAULT_PERCENTILES = (2.5, 50.0, 97.5)
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+class Uncertainties:
+    """
+    Per-substance standard uncertainties aligned with a ThermoTable.
+
+    Parameters
+    ----------
+    table : ThermoTable
+        Table the uncertainties belong to (same row order)
+    sigma : np.ndarray
+        (substances x 3) standard uncertainties for "H", "G", "E"
+    """
+
+    def __init__(self, table: ThermoTable, sigma: np.ndarray):
+        sigma = np.asarray(sigma, dtype=np.float64)
+        if sigma.shape != (len(table), len(PROPERTIES)):
+            raise ValueError(f"Expected uncertainties of shape {(len(table), len(PROPERTIES))}, got {sigma.shape}")
+        if np.any(sigma < 0):
+            raise ValueError("Uncertainties must be non-negative")
+        sigma.setflags(write=False)
+        self.table = table
+        self.sigma = sigma
+
+    @classmethod
+    def from_mapping(cls, table: ThermoTable, mapping: Dict[str, Dict[str, float]],
+                     default: float = 0.0) -> "Uncertainties":
+        """E.g. {"SO3(g)": {"H": 0.4, "G": 0.5}}; everything not listed gets `default`."""
+        sigma = np.full((len(table), len(PROPERTIES)), float(default))
+        for substance, values in mapping.items():
+            row = table.index(substance)
+            for prop, value in values.items():
+                if prop not in PROPERTIES:
+                    raise ValueError(f"Invalid property '{prop}'. Must be one of {set(PROPERTIES)}")
+                sigma[row, PROPERTIES.index(prop)] = value
+        return cls(table, sigma)
+
+    @classmethod
+    def from_csv(cls, table: ThermoTable, path: str, default: float = 0.0) -> "Uncertainties":
+        """
+        Read the "uH", "uG", "uE" columns of a CSV with a 'Substance'
+        column. Missing columns, blank or "?" cells give `default`.
+        Substances that aren't in `table` are ignored.
+        """
+        mapping = {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                substance = row["Substance"]
+                if substance not in table or substance in mapping:
+                    continue  # first row wins, like ThermoTable
+                values = {}
+                for prop, name in UNCERTAINTY_COLUMNS.items():
+                    value = _parse_value(row.get(name) or "")
+                    if not math.isnan(value):
+                        values[prop] = value
+                mapping[substance] = values
+        return cls.from_mapping(table, mapping, default)
+
+    def column(self, property_name: str) -> np.ndarray:
+        if property_name not in PROPERTIES:
+            raise ValueError(f"Invalid property '{property_name}'. Must be one of {set(PROPERTIES)}")
+        return self.sigma[:, PROPERTIES.index(property_name)]
+
+
+class UncertainResult(NamedTuple):
+    """
+    mean, std : np.ndarray
+        (reactions x 3) for ΔH°, ΔG°, ΔS° (columns "H", "G", "E")
+    q : Tuple[float, ...]
+        Percentile levels of `percentiles` (the requested ones plus their
+        complements 100 - q, sorted)
+    percentiles : np.ndarray
+        (len(q) x reactions x 3)
+    unknown : List[Tuple[str, ...]]
+        Unknown substances per reaction (those rows are NaN)
+    """
+    mean: np.ndarray
+    std: np.ndarray
+    q: Tuple[float, ...]
+    percentiles: np.ndarray
+    unknown: list
+
+    def column(self, property_name: str) -> Tuple[np.ndarray, np.ndarray]:
+        "(mean, std) of one property."
+        i = _property_index(property_name)
+        return self.mean[:, i], self.std[:, i]
+
+    def percentile(self, property_name: str, q: float) -> np.ndarray:
+        try:
+            k = self.q.index(float(q))
+        except ValueError:
+            raise ValueError(f"Percentile {q} wasn't computed, available: {self.q}") from None
+        return self.percentiles[k, :, _property_index(property_name)]
+
+    def band(self, property_name: str, low: float = 2.5, high: float = 97.5) -> Tuple[np.ndarray, np.ndarray]:
+        return self.percentile(property_name, low), self.percentile(property_name, high)
+
+    def k_band(self, T, low: float = 2.5, high: float = 97.5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Percentile band of K = exp(-ΔG°/RT) at temperature T (K). K falls
+        with ΔG°, so its low percentile is the high ΔG° percentile.
+        """
+        return (k_from_delta_g(self.percentile("G", 100.0 - low) * 1000.0, T, R),
+                k_from_delta_g(self.percentile("G", 100.0 - high) * 1000.0, T, R))
+
+
+def _property_index(property_name: str) -> int:
+    if property_name not in PROPERTIES:
+        raise ValueError(f"Invalid property '{property_name}'. Must be one of {set(PROPERTIES)}")
+    return PROPERTIES.index(property_name)
+
+
+def _levels(percentiles: Sequence[float]) -> Tuple[float, ...]:
+    levels = {float(q) for q in percentiles} | {100.0 - float(q) for q in percentiles}
+    if any(not 0.0 <= q <= 100.0 for q in levels):
+        raise ValueError("Percentiles must be between 0 and 100")
+    return tuple(sorted(levels))
+
+
+def propagate_linear(table: ThermoTable, uncertainties: Uncertainties, reactions: Iterable[Reaction],
+                     percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> UncertainResult:
+    """
+    Analytic propagation: mean is the batch value, σ² = Σ ν_i² σ_i² and
+    the percentiles are those of the resulting normal distribution.
+    """
+    matrix, unknown = compile_reactions(table, reactions)
+    mean = np.round(matrix @ property_matrix(table), 3)
+    squared = StoichiometryMatrix(matrix.indptr, matrix.indices, matrix.data ** 2, matrix.shape)
+    std = np.sqrt(squared @ uncertainties.sigma ** 2)
+
+    # Unknown substances blank the whole row, a '?' in the table only its
+    # property (the Monte Carlo path gets the same from NaN draws)
+    bad = np.array([bool(u) for u in unknown], dtype=bool)[:, None] | np.isnan(mean)
+    mean[bad] = np.nan
+    std[bad] = np.nan
+
+    q = _levels(percentiles)
+    z = np.array([NormalDist().inv_cdf(p / 100.0) if 0.0 < p < 100.0 else math.copysign(math.inf, p - 50.0)
+                  for p in q])
+    with np.errstate(invalid="ignore"):  # ±inf * 0 for the 0/100 levels of exact values
+        spread = np.where(std[None] > 0, z[:, None, None] * std[None], 0.0)
+    return UncertainResult(mean, std, q, mean[None] + spread, unknown)
+
+
+def _rows_per_block(samples: int, terms_per_row: float, max_bytes: int) -> int:
+    # substance draws, the weighted terms, the reaction sums and the sorted
+    # copy np.percentile makes, each (.. x 3 x samples) float64
+    per_row = 3 * 8 * samples * (2 * terms_per_row + 2)
+    return max(1, int(max_bytes // per_row))
+
+
+def propagate_monte_carlo(table: ThermoTable, uncertainties: Uncertainties, reactions: Iterable[Reaction],
+                          samples: int = 10000, percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                          seed: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> UncertainResult:
+    """
+    Monte Carlo propagation.
+
+    Reactions are processed in blocks sized so the sample arrays stay under
+    `max_bytes`; within a block all samples of all reactions come out of
+    one sparse product. Substances are drawn independently per block, so
+    each reaction's distribution is right but samples aren't shared
+    between blocks (results depend on `seed` and the block size).
+    """
+    if samples < 2:
+        raise ValueError("Need at least 2 samples")
+    matrix, unknown = compile_reactions(table, reactions)
+    values = property_matrix(table)
+    sigma = uncertainties.sigma
+    rng = np.random.default_rng(seed)
+    q = _levels(percentiles)
+
+    m = matrix.shape[0]
+    mean = np.full((m, 3), np.nan)
+    std = np.full((m, 3), np.nan)
+    pct = np.full((len(q), m, 3), np.nan)
+
+    rows = _rows_per_block(samples, matrix.data.size / max(m, 1), max_bytes)
+    for r0 in range(0, m, rows):
+        r1 = min(r0 + rows, m)
+        a, b = matrix.indptr[r0], matrix.indptr[r1]
+        if a == b:
+            continue
+        used, local = np.unique(matrix.indices[a:b], return_inverse=True)
+        draws = values[used][:, :, None] + sigma[used][:, :, None] * rng.standard_normal((used.size, 3, samples))
+        block = StoichiometryMatrix(matrix.indptr[r0:r1 + 1] - a, local.ravel(), matrix.data[a:b],
+                                    (r1 - r0, used.size))
+        sums = block @ draws  # (rows x 3 x samples)
+        mean[r0:r1] = sums.mean(axis=-1)
+        std[r0:r1] = sums.std(axis=-1, ddof=1)
+        pct[:, r0:r1] = np.percentile(sums, q, axis=-1)
+
+    bad = np.array([bool(u) for u in unknown], dtype=bool)
+    mean[bad] = std[bad] = np.nan
+    pct[:, bad] = np.nan
+    return UncertainResult(mean, std, q, pct, unknown)
+
+
+@instrumented("uncertainty.propagate_uncertainty")
+def propagate_uncertainty(table: ThermoTable, uncertainties: Uncertainties, reactions: Iterable[Reaction],
+                          method: str = "linear", **kwargs) -> UncertainResult:
+    """
+    ΔH°, ΔG°, ΔS° with uncertainty bands for a batch of reactions.
+
+    Parameters
+    ----------
+    table : ThermoTable
+        Appendix 2 table (a DataFrame is converted on the fly)
+    uncertainties : Uncertainties
+        Standard uncertainties for `table`
+    reactions : Iterable[Tuple[Dict, Dict]]
+        (reactants, products) pairs, same dicts as `calculate_reaction`
+    method : str
+        "linear" (analytic) or "monte-carlo"; extra keyword arguments go to
+        `propagate_linear` / `propagate_monte_carlo`
+    """
+    if not isinstance(table, ThermoTable):
+        table = ThermoTable.from_dataframe(table)
+    if uncertainties.table is not table and uncertainties.table.substances != table.substances:
+        raise ValueError("Uncertainties belong to a different table")
+    if method == "linear":
+        return propagate_linear(table, uncertainties, reactions, **kwargs)
+    if method == "monte-carlo":
+        return propagate_monte_carlo(table, uncertainties, reactions, **kwargs)
+    raise ValueError(f"Unknown method '{method}'. Must be 'linear' or 'monte-carlo'")